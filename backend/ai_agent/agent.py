@@ -5,13 +5,20 @@ Supports local open-source models with fallback to external APIs
 """
 
 import os
+import json
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
 from pydantic import BaseModel, Field
-from langchain_community.llms import Ollama
-from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from langchain_core.output_parsers import JsonOutputParser
+
+# LangChain, requests and the embedding stack are imported where they are
+# used, so importing this module (e.g. from the Django views) stays cheap.
+from .cache import ExactCache
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +63,268 @@ class SubtaskList(BaseModel):
     )
 
 
+class FullTaskAnalysis(BaseModel):
+    """Classification and subtasks produced by a single LLM call"""
+    classification: TaskClassification = Field(
+        description="Task classification"
+    )
+    subtasks: SubtaskList = Field(
+        description="Subtask breakdown"
+    )
+
+
+# ============================================
+# HELPERS
+# ============================================
+
+def _env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    """Read an optional integer from the environment"""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def warm_up_ollama(base_url: str, model: str, keep_alive: Optional[str] = None):
+    """
+    Load an Ollama model into memory and keep it resident
+
+    An empty prompt makes Ollama load the model without generating
+    anything, and keep_alive extends how long it stays loaded.
+
+    Args:
+        base_url: Ollama base URL
+        model: Ollama model name
+        keep_alive: Ollama duration (e.g., '1h'; '-1' keeps it loaded forever).
+            Defaults to OLLAMA_KEEP_ALIVE; when neither is set none is sent,
+            so the Ollama server's own OLLAMA_KEEP_ALIVE applies.
+    """
+    import requests
+
+    payload = {"model": model, "prompt": ""}
+    keep_alive = keep_alive or os.getenv('OLLAMA_KEEP_ALIVE')
+    if keep_alive:
+        payload["keep_alive"] = keep_alive
+
+    response = requests.post(f"{base_url}/api/generate", json=payload, timeout=120)
+    response.raise_for_status()
+    logger.info(f"Ollama model {model} warmed up")
+
+
+def ollama_has_model(base_url: str, model: str) -> bool:
+    """
+    Check that Ollama is reachable and the model has been pulled
+
+    Lists local models via /api/tags, which doesn't touch the inference engine.
+
+    Raises:
+        requests.RequestException: If Ollama is unreachable
+    """
+    import requests
+
+    response = requests.get(f"{base_url}/api/tags", timeout=2)
+    response.raise_for_status()
+    names = {entry.get('name') for entry in response.json().get('models', [])}
+    return model in names or f"{model}:latest" in names
+
+
+def pull_ollama_model(base_url: str, model: str):
+    """Download a model into Ollama (blocks until the pull finishes)"""
+    import requests
+
+    response = requests.post(
+        f"{base_url}/api/pull",
+        json={"name": model, "stream": False},
+        timeout=3600,
+    )
+    response.raise_for_status()
+    logger.info(f"Ollama model {model} pulled")
+
+
+# (base_url, model) pairs warmed (or being warmed) by this process
+_warmed_models = set()
+_warm_lock = threading.Lock()
+
+
+def warm_up_in_background(base_url: str, model: str, pull: bool = False):
+    """
+    Pull (optionally) and load an Ollama model on a daemon thread, once per process
+
+    A failed attempt is forgotten so the next agent retries it.
+    """
+    key = (base_url, model)
+    with _warm_lock:
+        if key in _warmed_models:
+            return
+        _warmed_models.add(key)
+
+    def run():
+        try:
+            if pull:
+                pull_ollama_model(base_url, model)
+            warm_up_ollama(base_url, model)
+        except Exception as e:
+            logger.warning(f"Background warmup of {model} failed: {e}")
+            with _warm_lock:
+                _warmed_models.discard(key)
+
+    threading.Thread(target=run, name='ollama-warmup', daemon=True).start()
+
+
+# ============================================
+# PROMPTS
+# ============================================
+# System prompts are sent verbatim (not templated) so every request shares
+# a byte-identical prefix that provider-side prompt caches can reuse.
+# Per-task values only appear in the user message.
+
+CLASSIFICATION_SYSTEM_PROMPT = """You are a task classification assistant.
+Analyze the task and classify it into ONE of these categories:
+- 'personal': personal life, hobbies, health, family, self-improvement
+- 'work': professional tasks, meetings, projects, career-related
+- 'urgent': time-sensitive tasks needing immediate attention (deadlines, emergencies)
+
+Also assign a priority level (1-5) where:
+- 5: Critical/Urgent - needs immediate action
+- 4: High - important, address soon
+- 3: Medium - normal priority
+- 2: Low - when time permits
+- 1: Very Low - nice to have
+
+You MUST respond with ONLY a valid JSON object (no additional text) in this EXACT format:
+{"category": "work", "reasoning": "Brief explanation here", "priority": 3}
+
+Do NOT wrap it in any other structure. Do NOT add explanations before or after."""
+
+CLASSIFICATION_USER_PROMPT = """Task Title: {title}
+
+Task Description: {description}
+
+Classify this task and respond with ONLY the JSON object."""
+
+SUBTASKS_SYSTEM_PROMPT = """You are a task breakdown assistant.
+Analyze the task complexity and break it down into the appropriate number of concrete, actionable subtasks.
+
+Guidelines:
+- Generate as many subtasks as needed (simple tasks may need 2-3, complex ones may need 10+)
+- Each subtask should be specific and achievable
+- Order them logically (what needs to happen first)
+- Make subtasks independent when possible
+- Use action verbs (Research, Create, Review, etc.)
+- Keep titles concise (3-8 words)
+- For complex tasks, don't hesitate to create comprehensive breakdowns
+
+You MUST respond with ONLY a valid JSON object (no additional text) in this EXACT format:
+{"subtasks": [{"title": "First subtask", "description": "Details"}, {"title": "Second subtask", "description": "Details"}], "reasoning": "Brief explanation"}
+
+Do NOT wrap it in any other structure. Do NOT add explanations before or after."""
+
+SUBTASKS_USER_PROMPT = """Task Title: {title}
+
+Task Description: {description}
+
+Break this down into subtasks and respond with ONLY the JSON object."""
+
+FULL_ANALYSIS_SYSTEM_PROMPT = """You are a task analysis assistant.
+Analyze the task, classify it, and break it down into subtasks.
+
+Classify it into ONE of these categories:
+- 'personal': personal life, hobbies, health, family, self-improvement
+- 'work': professional tasks, meetings, projects, career-related
+- 'urgent': time-sensitive tasks needing immediate attention (deadlines, emergencies)
+
+Assign a priority level (1-5) where:
+- 5: Critical/Urgent - needs immediate action
+- 4: High - important, address soon
+- 3: Medium - normal priority
+- 2: Low - when time permits
+- 1: Very Low - nice to have
+
+Break the task down into the appropriate number of concrete, actionable subtasks:
+- Generate as many subtasks as needed (simple tasks may need 2-3, complex ones may need 10+)
+- Each subtask should be specific and achievable
+- Order them logically (what needs to happen first)
+- Use action verbs (Research, Create, Review, etc.)
+- Keep titles concise (3-8 words)
+
+You MUST respond with ONLY a valid JSON object (no additional text) in this EXACT format:
+{"classification": {"category": "work", "reasoning": "Brief explanation here", "priority": 3}, "subtasks": {"subtasks": [{"title": "First subtask", "description": "Details"}, {"title": "Second subtask", "description": "Details"}], "reasoning": "Brief explanation"}}
+
+Do NOT wrap it in any other structure. Do NOT add explanations before or after."""
+
+FULL_ANALYSIS_USER_PROMPT = """Task Title: {title}
+
+Task Description: {description}
+
+Classify this task, break it down into subtasks, and respond with ONLY the JSON object."""
+
+
+# Bump to invalidate exact-match cache entries after prompt changes
+CACHE_VERSION = 'v1'
+
+# Output schema + system prompt fingerprints, part of the exact-match cache key
+PROMPT_HASHES = {
+    namespace: hashlib.sha256(
+        (json.dumps(schema.model_json_schema(), sort_keys=True) + system_prompt).encode()
+    ).hexdigest()
+    for namespace, schema, system_prompt in [
+        ('classification', TaskClassification, CLASSIFICATION_SYSTEM_PROMPT),
+        ('subtask_generation', SubtaskList, SUBTASKS_SYSTEM_PROMPT),
+        ('full_analysis', FullTaskAnalysis, FULL_ANALYSIS_SYSTEM_PROMPT),
+    ]
+}
+
+# Upper bound on concurrent LLM calls issued by the batch methods
+BATCH_MAX_CONCURRENCY = 8
+
+# Shared across agent instances
+_exact_cache = ExactCache(maxsize=1024)
+
+# Trivial inputs (e.g., "gym", "call mom") get a rule-based answer instead of
+# an LLM round-trip that would produce a generic result anyway
+FAST_PATH_MAX_CHARS = 20
+FAST_PATH_MAX_TITLE_WORDS = 5
+
+# Fast-path hits per namespace, for monitoring
+FAST_PATH_HITS = Counter()
+
+
+def _fast_path_result(namespace: str, title: str, description: str) -> Optional[dict]:
+    """
+    Return a rule-based result for a trivial task, or None if the LLM is needed
+
+    Args:
+        namespace: 'classification', 'subtask_generation' or 'full_analysis'
+        title: Task title
+        description: Task description
+    """
+    classification = None
+    if len(f"{title}{description}".strip()) < FAST_PATH_MAX_CHARS:
+        classification = {
+            "category": "personal",
+            "reasoning": "Short task - rule-based default",
+            "priority": 3
+        }
+
+    subtasks = None
+    if not description.strip() and len(title.split()) < FAST_PATH_MAX_TITLE_WORDS:
+        subtasks = {
+            "subtasks": [{"title": title.strip(), "description": "Complete this task"}],
+            "reasoning": "Simple task - no breakdown needed"
+        }
+
+    if namespace == 'classification':
+        result = classification
+    elif namespace == 'subtask_generation':
+        result = subtasks
+    elif classification and subtasks:
+        result = {"classification": classification, "subtasks": subtasks}
+    else:
+        result = None
+
+    if result is not None:
+        FAST_PATH_HITS[namespace] += 1
+    return result
+
+
 # ============================================
 # AI AGENT CLASS
 # ============================================
@@ -86,39 +355,105 @@ class TaskAIAgent:
             temperature: LLM temperature (0-1, lower = more deterministic)
             use_fallback: Whether to use external APIs as fallback
         """
-        self.model = model or os.getenv('OLLAMA_MODEL', 'llama3.2:3b')
+        self.model = model or os.getenv('OLLAMA_MODEL', 'llama3.2:3b-instruct-q4_K_M')
         self.base_url = base_url or os.getenv('OLLAMA_BASE_URL', 'http://ollama:11434')
         self.temperature = temperature
         self.use_fallback = use_fallback
 
+        # Set by _initialize_llm when the Ollama backend is active
+        self.constrained_decoding = False
+        # Set by _initialize_llm when Ollama was unavailable and an external API is used
+        self.using_fallback = False
+
         # Initialize LLM
         self.llm = self._initialize_llm()
 
+        # Build prompts, parsers and chains once per agent
+        self._build_chains()
+
+        # Initialize response cache (None when disabled/unavailable)
+        self.embedder = None
+        self.semantic_cache = self._initialize_semantic_cache()
+
         logger.info(f"TaskAIAgent initialized with model: {self.model}")
 
     def _initialize_llm(self):
-        """Initialize the LLM (Ollama or fallback)"""
+        """Initialize the LLM (vLLM, Ollama or fallback)"""
+        if os.getenv('VLLM_BASE_URL'):
+            llm = self._initialize_vllm()
+            if llm is not None:
+                return llm
+
         try:
             # Try Ollama first
+            from langchain_community.llms import Ollama
+
             llm = Ollama(
                 model=self.model,
                 base_url=self.base_url,
                 temperature=self.temperature,
+                # Grammar-constrained decoding: the model can only emit valid JSON
+                format="json",
+                # Task prompts are short; a small context keeps the KV cache lean
+                num_ctx=_env_int('OLLAMA_NUM_CTX', 1024),
+                num_gpu=_env_int('OLLAMA_NUM_GPU'),
+                num_thread=_env_int('OLLAMA_NUM_THREAD'),
+            ).bind(
+                # Not fields on the Ollama client; forwarded as request options
+                num_batch=_env_int('OLLAMA_NUM_BATCH', 512),
+                num_predict=_env_int('OLLAMA_NUM_PREDICT', 512),
             )
 
-            # Test connection
-            llm.invoke("test")
+            # Cheap liveness check; the model is loaded off the request path
+            pull = False
+            if not ollama_has_model(self.base_url, self.model):
+                if os.getenv('OLLAMA_AUTO_PULL', 'False') != 'True':
+                    raise RuntimeError(f"Model {self.model} is not pulled")
+                logger.warning(f"Model {self.model} not found, pulling it in the background")
+                pull = True
+            warm_up_in_background(self.base_url, self.model, pull=pull)
             logger.info(f"Successfully connected to Ollama at {self.base_url}")
+            self.constrained_decoding = True
             return llm
 
         except Exception as e:
             logger.warning(f"Failed to connect to Ollama: {e}")
 
             if self.use_fallback:
+                self.using_fallback = True
                 return self._initialize_fallback_llm()
             else:
                 raise RuntimeError(f"Ollama not available and fallback disabled: {e}")
 
+    def _initialize_vllm(self):
+        """
+        Initialize a vLLM server through its OpenAI-compatible API
+
+        Run vLLM with --enable-prefix-caching so the static system prompts
+        are prefilled once and reused across requests.
+        """
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError:
+            logger.warning("langchain-openai not installed, can't use vLLM")
+            return None
+
+        base_url = os.getenv('VLLM_BASE_URL').rstrip('/')
+        self.model = os.getenv('VLLM_MODEL', 'meta-llama/Meta-Llama-3-8B-Instruct')
+        llm = ChatOpenAI(
+            base_url=f"{base_url}/v1",
+            api_key="EMPTY",
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=_env_int('VLLM_MAX_TOKENS', 512),
+        )
+        logger.info(f"Using vLLM at {base_url}")
+        return llm
+
+    def warmup(self, keep_alive: Optional[str] = None):
+        """Load the Ollama model into memory and keep it resident"""
+        warm_up_ollama(self.base_url, self.model, keep_alive)
+
     def _initialize_fallback_llm(self):
         """Initialize fallback LLM (Anthropic or OpenAI)"""
         # Try Anthropic Claude
@@ -131,6 +466,8 @@ class TaskAIAgent:
                     temperature=self.temperature,
                     api_key=anthropic_key
                 )
+                # Cache keys and logs name the model actually answering
+                self.model = llm.model
                 logger.info("Using Anthropic Claude as fallback")
                 return llm
             except ImportError:
@@ -146,6 +483,7 @@ class TaskAIAgent:
                     temperature=self.temperature,
                     api_key=openai_key
                 )
+                self.model = llm.model_name
                 logger.info("Using OpenAI GPT as fallback")
                 return llm
             except ImportError:
@@ -153,67 +491,243 @@ class TaskAIAgent:
 
         raise RuntimeError("No LLM available (Ollama failed, no API keys)")
 
-    def classify_task(self, title: str, description: str) -> dict:
+    def _build_chains(self):
+        """Compose the classification, subtask generation and full analysis chains"""
+        from langchain.prompts import ChatPromptTemplate
+        from .parsers import OrjsonOutputParser
+
+        self._classify_parser = OrjsonOutputParser()
+        self._classify_prompt = ChatPromptTemplate.from_messages([
+            self._system_message(CLASSIFICATION_SYSTEM_PROMPT),
+            ("user", CLASSIFICATION_USER_PROMPT),
+        ])
+        self._classify_chain = (
+            self._classify_prompt | self._structured_llm(TaskClassification) | self._classify_parser
+        )
+
+        self._subtasks_parser = OrjsonOutputParser()
+        self._subtasks_prompt = ChatPromptTemplate.from_messages([
+            self._system_message(SUBTASKS_SYSTEM_PROMPT),
+            ("user", SUBTASKS_USER_PROMPT),
+        ])
+        self._subtasks_chain = (
+            self._subtasks_prompt | self._structured_llm(SubtaskList) | self._subtasks_parser
+        )
+
+        self._full_parser = OrjsonOutputParser()
+        self._full_prompt = ChatPromptTemplate.from_messages([
+            self._system_message(FULL_ANALYSIS_SYSTEM_PROMPT),
+            ("user", FULL_ANALYSIS_USER_PROMPT),
+        ])
+        self._full_chain = self._full_prompt | self._structured_llm(FullTaskAnalysis) | self._full_parser
+
+    def _structured_llm(self, schema: type):
         """
-        Classify a task into categories
+        Return the LLM constrained to a response schema
+
+        Ollama >= 0.5 accepts a JSON schema as `format` and only samples
+        schema-valid tokens. Set OLLAMA_JSON_SCHEMA=False on older servers
+        to keep plain JSON mode. Other backends get the LLM unchanged.
+        """
+        if not self.constrained_decoding or os.getenv('OLLAMA_JSON_SCHEMA', 'True') != 'True':
+            return self.llm
+        return self.llm.bind(format=schema.model_json_schema())
+
+    def _system_message(self, text: str):
+        """
+        Build a static system message
+
+        Anthropic only caches prompt prefixes marked with cache_control,
+        so the block is tagged when Claude is the active fallback.
+        """
+        from langchain_core.messages import SystemMessage
+
+        if type(self.llm).__name__ == 'ChatAnthropic':
+            return SystemMessage(content=[{
+                "type": "text",
+                "text": text,
+                "cache_control": {"type": "ephemeral"},
+            }])
+        return SystemMessage(content=text)
+
+    def _initialize_semantic_cache(self):
+        """Initialize the embedding-similarity response cache (None when disabled)"""
+        if os.getenv('SEMANTIC_CACHE_ENABLED', 'True') != 'True':
+            return None
+
+        from .cache import SemanticCache
+
+        try:
+            from langchain_community.embeddings import HuggingFaceEmbeddings
+            self.embedder = HuggingFaceEmbeddings(
+                model_name=os.getenv(
+                    'SEMANTIC_CACHE_EMBEDDING_MODEL',
+                    'sentence-transformers/all-MiniLM-L6-v2'
+                )
+            )
+        except ImportError:
+            logger.warning("sentence-transformers not installed, semantic cache disabled")
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load embedding model, semantic cache disabled: {e}")
+            return None
+
+        cache = SemanticCache(
+            path=os.getenv(
+                'SEMANTIC_CACHE_PATH',
+                os.path.join(tempfile.gettempdir(), 'ai_semantic_cache.sqlite3')
+            ),
+            threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92')),
+            ttl=int(os.getenv('SEMANTIC_CACHE_TTL', '86400')),
+            max_entries=int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '10000')),
+        )
+        logger.info(f"Semantic cache enabled at {cache.path}")
+        return cache
+
+    def _cache_key(self, namespace: str, title: str, description: str) -> str:
+        """Build the exact-match cache key for a prompt"""
+        raw = "|".join([
+            self.model,
+            str(self.temperature),
+            title,
+            description,
+            namespace,
+            CACHE_VERSION,
+            PROMPT_HASHES.get(namespace, ''),
+        ])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _semantic_namespace(self, namespace: str) -> str:
+        """Build the semantic cache namespace, scoped like _cache_key to the model and prompt"""
+        return "|".join([
+            namespace,
+            self.model,
+            str(self.temperature),
+            CACHE_VERSION,
+            PROMPT_HASHES.get(namespace, ''),
+        ])
+
+    def _cache_lookup(self, namespace: str, title: str, description: str) -> Tuple[Optional[dict], Any]:
+        """
+        Look up an identical or near-duplicate task in the response caches
+
+        Trivial tasks are answered by rule before the caches are consulted.
+
+        Returns:
+            (cached response or None, embedding to reuse in _cache_store)
+        """
+        fast = _fast_path_result(namespace, title, description)
+        if fast is not None:
+            logger.info(f"Fast path for {namespace}: {title}")
+            return fast, None
+
+        key = self._cache_key(namespace, title, description)
+        cached = _exact_cache.get(key)
+        if cached is not None:
+            logger.info(f"Exact cache hit for {namespace}: {title}")
+            return cached, None
+
+        if self.semantic_cache is None:
+            return None, None
+
+        # The semantic cache is an optimization; its failures must not fail the request
+        try:
+            embedding = self.embedder.embed_query(f"{title}\n{description}")
+            cached = self.semantic_cache.get(self._semantic_namespace(namespace), embedding)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed for {namespace}: {e}")
+            return None, None
+
+        if cached is not None:
+            logger.info(f"Semantic cache hit for {namespace}: {title}")
+            _exact_cache.set(key, cached)
+        return cached, embedding
+
+    def _cache_store(self, namespace: str, title: str, description: str, result: dict, embedding=None):
+        """Store a freshly computed response in the response caches"""
+        _exact_cache.set(self._cache_key(namespace, title, description), result)
+        if self.semantic_cache is not None and embedding is not None:
+            try:
+                self.semantic_cache.set(self._semantic_namespace(namespace), embedding, result)
+            except Exception as e:
+                logger.warning(f"Semantic cache store failed for {namespace}: {e}")
+
+    def _cached(self, namespace: str, title: str, description: str, compute: Callable[[], dict]) -> dict:
+        """
+        Return a cached response for an identical or near-duplicate task,
+        or compute and store it
 
         Args:
+            namespace: Cache namespace, one per analysis type
             title: Task title
             description: Task description
+            compute: Performs the LLM call; exceptions propagate and are not cached
 
         Returns:
-            dict with 'category', 'reasoning', 'priority'
+            Response dict
         """
-        try:
-            parser = JsonOutputParser()
+        cached, embedding = self._cache_lookup(namespace, title, description)
+        if cached is not None:
+            return cached
 
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are a task classification assistant.
-                Analyze the task and classify it into ONE of these categories:
-                - 'personal': personal life, hobbies, health, family, self-improvement
-                - 'work': professional tasks, meetings, projects, career-related
-                - 'urgent': time-sensitive tasks needing immediate attention (deadlines, emergencies)
+        result = compute()
+        self._cache_store(namespace, title, description, result, embedding)
+        return result
 
-                Also assign a priority level (1-5) where:
-                - 5: Critical/Urgent - needs immediate action
-                - 4: High - important, address soon
-                - 3: Medium - normal priority
-                - 2: Low - when time permits
-                - 1: Very Low - nice to have
+    async def _acached(self, namespace: str, title: str, description: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+        """Async variant of _cached; compute returns an awaitable"""
+        # Embedding, SQLite I/O and copies block; keep them off the event loop
+        cached, embedding = await asyncio.to_thread(self._cache_lookup, namespace, title, description)
+        if cached is not None:
+            return cached
 
-                You MUST respond with ONLY a valid JSON object (no additional text) in this EXACT format:
-                {{"category": "work", "reasoning": "Brief explanation here", "priority": 3}}
+        result = await compute()
+        await asyncio.to_thread(self._cache_store, namespace, title, description, result, embedding)
+        return result
 
-                Do NOT wrap it in any other structure. Do NOT add explanations before or after."""),
-                ("user", """Task Title: {title}
-
-Task Description: {description}
+    def classify_task(self, title: str, description: str) -> dict:
+        """
+        Classify a task into categories
 
-Classify this task and respond with ONLY the JSON object.""")
-            ])
+        Args:
+            title: Task title
+            description: Task description
 
-            chain = prompt | self.llm | parser
+        Returns:
+            dict with 'category', 'reasoning', 'priority'
 
-            result = chain.invoke({
+        Raises:
+            Exception: If the LLM call fails or returns an invalid result
+        """
+        result = self._cached(
+            'classification', title, description,
+            lambda: self._validate_classification(self._classify_chain.invoke({
+                "title": title,
+                "description": description
+            }))
+        )
+        logger.info(f"Task classified: {result['category']} (priority: {result['priority']})")
+        return result
+
+    async def _classify_async(self, title: str, description: str) -> dict:
+        """Async variant of classify_task"""
+        async def compute():
+            return self._validate_classification(await self._classify_chain.ainvoke({
                 "title": title,
                 "description": description
-            })
+            }))
 
-            # Validate result has required fields
-            if not all(k in result for k in ['category', 'reasoning', 'priority']):
-                raise ValueError(f"Invalid response structure: {result}")
+        result = await self._acached('classification', title, description, compute)
+        logger.info(f"Task classified: {result['category']} (priority: {result['priority']})")
+        return result
 
-            logger.info(f"Task classified: {result['category']} (priority: {result['priority']})")
-            return result
+    @staticmethod
+    def _validate_classification(result) -> dict:
+        """Validate a classification result against the TaskClassification schema"""
+        if not isinstance(result, dict) or not all(k in result for k in ['category', 'reasoning', 'priority']):
+            raise ValueError(f"Invalid response structure: {result}")
 
-        except Exception as e:
-            logger.error(f"Classification failed: {e}")
-            # Return safe default
-            return {
-                "category": "other",
-                "reasoning": f"Classification unavailable: {str(e)}",
-                "priority": 3
-            }
+        return TaskClassification.model_validate(result).model_dump()
 
     def suggest_subtasks(self, title: str, description: str) -> dict:
         """
@@ -225,59 +739,90 @@ Classify this task and respond with ONLY the JSON object.""")
 
         Returns:
             dict with 'subtasks' (list) and 'reasoning'
+
+        Raises:
+            Exception: If the LLM call fails or returns an invalid result
         """
-        try:
-            parser = JsonOutputParser()
+        result = self._cached(
+            'subtask_generation', title, description,
+            lambda: self._validate_subtasks(self._subtasks_chain.invoke({
+                "title": title,
+                "description": description
+            }))
+        )
+        logger.info(f"Generated {len(result.get('subtasks', []))} subtasks")
+        return result
+
+    async def _suggest_async(self, title: str, description: str) -> dict:
+        """Async variant of suggest_subtasks"""
+        async def compute():
+            return self._validate_subtasks(await self._subtasks_chain.ainvoke({
+                "title": title,
+                "description": description
+            }))
 
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are a task breakdown assistant.
-                Analyze the task complexity and break it down into the appropriate number of concrete, actionable subtasks.
+        result = await self._acached('subtask_generation', title, description, compute)
+        logger.info(f"Generated {len(result.get('subtasks', []))} subtasks")
+        return result
 
-                Guidelines:
-                - Generate as many subtasks as needed (simple tasks may need 2-3, complex ones may need 10+)
-                - Each subtask should be specific and achievable
-                - Order them logically (what needs to happen first)
-                - Make subtasks independent when possible
-                - Use action verbs (Research, Create, Review, etc.)
-                - Keep titles concise (3-8 words)
-                - For complex tasks, don't hesitate to create comprehensive breakdowns
+    @staticmethod
+    def _validate_subtasks(result) -> dict:
+        """Validate a subtask generation result against the SubtaskList schema"""
+        if not isinstance(result, dict) or not isinstance(result.get('subtasks'), list):
+            raise ValueError(f"Invalid response structure: {result}")
 
-                You MUST respond with ONLY a valid JSON object (no additional text) in this EXACT format:
-                {{"subtasks": [{{"title": "First subtask", "description": "Details"}}, {{"title": "Second subtask", "description": "Details"}}], "reasoning": "Brief explanation"}}
+        return SubtaskList.model_validate(result).model_dump()
 
-                Do NOT wrap it in any other structure. Do NOT add explanations before or after."""),
-                ("user", """Task Title: {title}
+    def analyze_task(self, title: str, description: str) -> dict:
+        """
+        Perform complete task analysis in a single LLM call
 
-Task Description: {description}
+        Falls back to running classification and subtask generation on two
+        threads if the combined response doesn't match the schema. Runs the
+        chains synchronously: the agent is shared across requests, and chat
+        models' async HTTP clients are bound to the event loop that first
+        used them, so a per-call asyncio.run() would break them.
 
-Break this down into subtasks and respond with ONLY the JSON object.""")
-            ])
+        Args:
+            title: Task title
+            description: Task description
 
-            chain = prompt | self.llm | parser
+        Returns:
+            dict with 'classification' and 'subtasks'
 
-            result = chain.invoke({
-                "title": title,
-                "description": description
-            })
+        Raises:
+            Exception: If the LLM calls fail
+        """
+        logger.info(f"Analyzing task: {title}")
 
-            # Validate result has required fields
-            if 'subtasks' not in result or not isinstance(result['subtasks'], list):
-                raise ValueError(f"Invalid response structure: {result}")
+        try:
+            return self._cached(
+                'full_analysis', title, description,
+                lambda: self._validate_full_analysis(self._full_chain.invoke({
+                    "title": title,
+                    "description": description
+                }))
+            )
 
-            logger.info(f"Generated {len(result.get('subtasks', []))} subtasks")
-            return result
+        except ValueError as e:
+            # Invalid JSON or schema mismatch; connection errors propagate
+            logger.warning(f"Combined analysis failed, falling back to separate calls: {e}")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            classification = pool.submit(self.classify_task, title, description)
+            subtasks = pool.submit(self.suggest_subtasks, title, description)
 
-        except Exception as e:
-            logger.error(f"Subtask generation failed: {e}")
-            # Return safe default
             return {
-                "subtasks": [],
-                "reasoning": f"Subtask generation unavailable: {str(e)}"
+                "classification": classification.result(),
+                "subtasks": subtasks.result()
             }
 
-    def analyze_task(self, title: str, description: str) -> dict:
+    async def analyze_task_async(self, title: str, description: str) -> dict:
         """
-        Perform complete task analysis (classification + subtasks)
+        Async variant of analyze_task, for callers on a long-lived event loop
+
+        Falls back to running classification and subtask generation
+        concurrently if the combined response doesn't match the schema.
 
         Args:
             title: Task title
@@ -285,22 +830,144 @@ Break this down into subtasks and respond with ONLY the JSON object.""")
 
         Returns:
             dict with 'classification' and 'subtasks'
+
+        Raises:
+            Exception: If the LLM calls fail
         """
         logger.info(f"Analyzing task: {title}")
 
-        classification = self.classify_task(title, description)
-        subtasks = self.suggest_subtasks(title, description)
+        async def compute():
+            return self._validate_full_analysis(await self._full_chain.ainvoke({
+                "title": title,
+                "description": description
+            }))
+
+        try:
+            return await self._acached('full_analysis', title, description, compute)
+
+        except ValueError as e:
+            # Invalid JSON or schema mismatch; connection errors propagate
+            logger.warning(f"Combined analysis failed, falling back to separate calls: {e}")
+
+        classification, subtasks = await asyncio.gather(
+            self._classify_async(title, description),
+            self._suggest_async(title, description),
+        )
 
         return {
             "classification": classification,
             "subtasks": subtasks
         }
 
-    def analyze_task_stream(self, title: str, description: str):
+    @staticmethod
+    def _validate_full_analysis(result) -> dict:
+        """Validate a combined analysis result against the FullTaskAnalysis schema"""
+        if not isinstance(result, dict) or not all(k in result for k in ['classification', 'subtasks']):
+            raise ValueError(f"Invalid response structure: {result}")
+
+        return FullTaskAnalysis.model_validate(result).model_dump()
+
+    def classify_tasks(self, pairs: List[Tuple[str, str]]) -> List[Any]:
+        """
+        Classify several tasks with one batched chain call
+
+        Args:
+            pairs: (title, description) tuples
+
+        Returns:
+            Classification dicts (or the exception for a failed task), in input order
+        """
+        return self._batch_cached(
+            'classification', pairs, self._classify_chain, self._validate_classification
+        )
+
+    def suggest_subtasks_batch(self, pairs: List[Tuple[str, str]]) -> List[Any]:
+        """
+        Generate subtasks for several tasks with one batched chain call
+
+        Args:
+            pairs: (title, description) tuples
+
+        Returns:
+            Subtask dicts (or the exception for a failed task), in input order
+        """
+        return self._batch_cached(
+            'subtask_generation', pairs, self._subtasks_chain, self._validate_subtasks
+        )
+
+    def analyze_tasks(self, pairs: List[Tuple[str, str]]) -> List[Any]:
+        """
+        Perform complete analysis of several tasks with one batched chain call
+
+        Args:
+            pairs: (title, description) tuples
+
+        Returns:
+            dicts with 'classification' and 'subtasks' (or the exception for a
+            failed task), in input order
+        """
+        return self._batch_cached(
+            'full_analysis', pairs, self._full_chain, self._validate_full_analysis
+        )
+
+    def _batch_cached(self, namespace: str, pairs: List[Tuple[str, str]], chain,
+                      validate: Callable[[Any], dict]) -> List[Any]:
+        """Serve cached pairs, batch the rest through chain, and cache the new results"""
+        results, misses = self._split_cached(namespace, pairs)
+
+        if misses:
+            outputs = chain.batch(
+                [{"title": title, "description": description} for _, title, description, _ in misses],
+                config={"max_concurrency": BATCH_MAX_CONCURRENCY},
+                return_exceptions=True,
+            )
+            for (idx, title, description, embedding), output in zip(misses, outputs):
+                results[idx] = self._batch_result(
+                    namespace, title, description, embedding, output, validate
+                )
+
+        return results
+
+    def _split_cached(self, namespace: str, pairs: List[Tuple[str, str]]) -> Tuple[List[Optional[dict]], list]:
+        """
+        Resolve batch inputs against the response caches
+
+        Returns:
+            (results with cache hits filled in, [(idx, title, description, embedding)] misses)
+        """
+        results = [None] * len(pairs)
+        misses = []
+
+        for idx, (title, description) in enumerate(pairs):
+            cached, embedding = self._cache_lookup(namespace, title, description)
+            if cached is not None:
+                results[idx] = cached
+            else:
+                misses.append((idx, title, description, embedding))
+
+        return results, misses
+
+    def _batch_result(self, namespace: str, title: str, description: str, embedding, output,
+                      validate: Callable[[Any], dict]) -> Any:
+        """Validate and cache one batch output, or return its exception"""
+        try:
+            if isinstance(output, Exception):
+                raise output
+            result = validate(output)
+        except Exception as e:
+            logger.error(f"Batch {namespace} failed for '{title}': {e}")
+            return e
+
+        self._cache_store(namespace, title, description, result, embedding)
+        return result
+
+    async def analyze_task_stream_async(self, title: str, description: str):
         """
         Perform complete task analysis with streaming progress updates
 
-        This is a generator that yields progress events for SSE streaming
+        Classification and subtask generation stream concurrently. Partial
+        JSON objects are emitted as 'token' events while the model generates,
+        and a progress event is emitted for each step as soon as it finishes.
 
         Args:
             title: Task title
@@ -308,80 +975,125 @@ Break this down into subtasks and respond with ONLY the JSON object.""")
 
         Yields:
             dict events with 'type', 'message', and optional 'data'
-        """
-        import time
 
+        Raises:
+            RuntimeError: If a step failed; no 'complete' event is emitted
+        """
         yield {
             "type": "start",
             "message": "🚀 Starting AI analysis...",
             "step": "initialization"
         }
 
-        time.sleep(0.3)  # Small delay for UX
+        inputs = {"title": title, "description": description}
+        events = asyncio.Queue()
 
-        # Step 1: Classification
-        yield {
-            "type": "progress",
-            "message": "🔍 Analyzing task category and priority...",
-            "step": "classification"
-        }
+        async def run_step(step, namespace, chain, validate):
+            """Stream one chain, pushing partial results and the final one onto the queue"""
+            try:
+                # Embedding, SQLite I/O and copies block; keep them off the event loop
+                result, embedding = await asyncio.to_thread(
+                    self._cache_lookup, namespace, title, description
+                )
+                if result is None:
+                    partial = None
+                    async for partial in chain.astream(inputs):
+                        await events.put(("token", step, partial))
+                    result = validate(partial)
+                    await asyncio.to_thread(
+                        self._cache_store, namespace, title, description, result, embedding
+                    )
+                await events.put(("done", step, result))
+            except Exception as e:
+                await events.put(("error", step, e))
+
+        steps = [
+            asyncio.ensure_future(run_step(
+                "classification", "classification",
+                self._classify_chain, self._validate_classification
+            )),
+            asyncio.ensure_future(run_step(
+                "subtasks", "subtask_generation",
+                self._subtasks_chain, self._validate_subtasks
+            )),
+        ]
+
+        classification = None
+        subtasks = None
+        failures = []
 
         try:
-            classification = self.classify_task(title, description)
-
             yield {
                 "type": "progress",
-                "message": f"✅ Classified as '{classification['category']}' with priority {classification['priority']}/5",
-                "step": "classification",
-                "data": classification
-            }
-
-        except Exception as e:
-            logger.error(f"Classification failed: {e}")
-            yield {
-                "type": "error",
-                "message": f"⚠️ Classification failed: {str(e)}",
+                "message": "🔍 Analyzing task category and priority...",
                 "step": "classification"
             }
-            classification = {
-                "category": "other",
-                "reasoning": "Classification failed",
-                "priority": 3
-            }
-
-        time.sleep(0.5)
-
-        # Step 2: Subtask Generation
-        yield {
-            "type": "progress",
-            "message": "🧩 Breaking down task into subtasks...",
-            "step": "subtasks"
-        }
-
-        try:
-            subtasks = self.suggest_subtasks(title, description)
-            subtask_count = len(subtasks.get('subtasks', []))
 
             yield {
                 "type": "progress",
-                "message": f"✅ Generated {subtask_count} actionable subtasks",
-                "step": "subtasks",
-                "data": subtasks
-            }
-
-        except Exception as e:
-            logger.error(f"Subtask generation failed: {e}")
-            yield {
-                "type": "error",
-                "message": f"⚠️ Subtask generation failed: {str(e)}",
+                "message": "🧩 Breaking down task into subtasks...",
                 "step": "subtasks"
             }
-            subtasks = {
-                "subtasks": [],
-                "reasoning": "Subtask generation failed"
-            }
 
-        time.sleep(0.3)
+            remaining = len(steps)
+            while remaining:
+                kind, step, payload = await events.get()
+
+                if kind == "token":
+                    yield {
+                        "type": "token",
+                        "step": step,
+                        "data": payload
+                    }
+                    continue
+
+                remaining -= 1
+
+                if step == "classification":
+                    if kind == "done":
+                        classification = payload
+                        yield {
+                            "type": "progress",
+                            "message": f"✅ Classified as '{classification['category']}' with priority {classification['priority']}/5",
+                            "step": "classification",
+                            "data": classification
+                        }
+                    else:
+                        logger.error(f"Classification failed: {payload}")
+                        failures.append(f"classification: {payload}")
+                        yield {
+                            "type": "error",
+                            "message": f"⚠️ Classification failed: {str(payload)}",
+                            "step": "classification"
+                        }
+
+                else:
+                    if kind == "done":
+                        subtasks = payload
+                        subtask_count = len(subtasks.get('subtasks', []))
+                        yield {
+                            "type": "progress",
+                            "message": f"✅ Generated {subtask_count} actionable subtasks",
+                            "step": "subtasks",
+                            "data": subtasks
+                        }
+                    else:
+                        logger.error(f"Subtask generation failed: {payload}")
+                        failures.append(f"subtask generation: {payload}")
+                        yield {
+                            "type": "error",
+                            "message": f"⚠️ Subtask generation failed: {str(payload)}",
+                            "step": "subtasks"
+                        }
+        finally:
+            # Stop generating tokens if the client went away
+            for pending in steps:
+                pending.cancel()
+            await asyncio.gather(*steps, return_exceptions=True)
+
+        # A partial result would overwrite the task with placeholders
+        if failures:
+            raise RuntimeError(f"Analysis failed ({'; '.join(failures)})")
 
         # Final result
         result = {
@@ -0,0 +1,261 @@
+# backend/ai_agent/cache.py
+"""
+Response caches for the AI agent
+Lets near-duplicate task analyses skip the LLM round-trip entirely
+
+numpy is imported lazily so the exact-match cache stays import-cheap.
+"""
+
+import copy
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class ExactCache:
+    """
+    In-process LRU cache for LLM responses keyed by an exact prompt hash
+
+    Values are deep-copied on the way in and out so callers can mutate
+    returned dicts without corrupting the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached response, or None on a miss"""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return copy.deepcopy(self._data[key])
+
+    def set(self, key: str, response: dict):
+        """Store a copy of a response, evicting the least recently used entry"""
+        with self._lock:
+            self._data[key] = copy.deepcopy(response)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for LLM responses
+
+    Rows of (namespace, embedding, response_json, expires_at) are persisted in
+    SQLite, which every worker shares. Each namespace keeps an in-memory matrix
+    of normalized embeddings, so a lookup is a single top-1 dot product; rows
+    written by other workers are pulled in every `sync_interval` seconds.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.92, ttl: int = 86400,
+                 max_entries: int = 10000, sync_interval: float = 5.0):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file
+            threshold: Minimum cosine similarity for a hit
+            ttl: Default time-to-live of an entry in seconds
+            max_entries: Maximum entries kept per namespace (oldest evicted first)
+            sync_interval: Seconds between checks for rows written by other workers
+        """
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sync_interval = sync_interval
+
+        self._lock = threading.Lock()
+        # Every worker writes to the same file: WAL lets readers run alongside
+        # a writer, and the timeout waits out a competing write lock
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # AUTOINCREMENT so ids never go backwards; workers sync on id > last seen
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS semantic_responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS semantic_responses_namespace ON semantic_responses (namespace, id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS semantic_responses_expires ON semantic_responses (expires_at)"
+        )
+        self._conn.commit()
+
+        # namespace -> {"matrix", "expires", "responses", "size", "last_id", "synced_at"}
+        self._index = {}
+
+    @staticmethod
+    def _normalize(embedding):
+        """Return the embedding as a unit-length float32 vector"""
+        import numpy as np
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _entry(self, namespace: str) -> dict:
+        """Return the in-memory index of a namespace, creating an empty one"""
+        entry = self._index.get(namespace)
+        if entry is None:
+            entry = self._index[namespace] = {
+                "matrix": None,
+                "expires": None,
+                "responses": [],
+                "size": 0,
+                "last_id": 0,
+                "synced_at": 0.0,
+            }
+        return entry
+
+    @staticmethod
+    def _append(entry: dict, vector, payload: str, expires_at: float):
+        """Append a row, growing the preallocated arrays geometrically"""
+        import numpy as np
+
+        size = entry["size"]
+        if entry["matrix"] is None:
+            entry["matrix"] = np.empty((16, vector.shape[0]), dtype=np.float32)
+            entry["expires"] = np.empty(16, dtype=np.float64)
+        elif size == entry["matrix"].shape[0]:
+            matrix = np.empty((size * 2, entry["matrix"].shape[1]), dtype=np.float32)
+            matrix[:size] = entry["matrix"]
+            expires = np.empty(size * 2, dtype=np.float64)
+            expires[:size] = entry["expires"]
+            entry["matrix"], entry["expires"] = matrix, expires
+
+        entry["matrix"][size] = vector
+        entry["expires"][size] = expires_at
+        entry["responses"].append(payload)
+        entry["size"] = size + 1
+
+    def _compact(self, entry: dict, now: float):
+        """Drop expired rows and keep at most max_entries (the newest)"""
+        import numpy as np
+
+        size = entry["size"]
+        if not size:
+            return
+        keep = np.flatnonzero(entry["expires"][:size] >= now)[-self.max_entries:]
+        if len(keep) == size:
+            return
+
+        count = len(keep)
+        entry["matrix"][:count] = entry["matrix"][keep]
+        entry["expires"][:count] = entry["expires"][keep]
+        entry["responses"] = [entry["responses"][i] for i in keep]
+        entry["size"] = count
+
+    def _sync(self, namespace: str, entry: dict, force: bool = False):
+        """Pull rows written since the last sync, by this or any other worker"""
+        import numpy as np
+
+        now = time.time()
+        if not force and now - entry["synced_at"] < self.sync_interval:
+            return
+        entry["synced_at"] = now
+
+        rows = self._conn.execute(
+            "SELECT id, embedding, response, expires_at FROM semantic_responses "
+            "WHERE namespace = ? AND id > ? ORDER BY id",
+            (namespace, entry["last_id"])
+        ).fetchall()
+        for row_id, embedding, response, expires_at in rows:
+            self._append(entry, np.frombuffer(embedding, dtype=np.float32), response, expires_at)
+            entry["last_id"] = row_id
+
+        self._compact(entry, now)
+
+    def get(self, namespace: str, embedding) -> Optional[dict]:
+        """
+        Look up the closest unexpired cached response
+
+        Args:
+            namespace: Cache namespace (e.g., 'classification'), including
+                anything that invalidates responses (model, prompt version)
+            embedding: Query embedding
+
+        Returns:
+            The cached response dict, or None on a miss
+        """
+        import numpy as np
+
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            entry = self._entry(namespace)
+            self._sync(namespace, entry)
+            size = entry["size"]
+            if not size:
+                return None
+
+            scores = entry["matrix"][:size] @ vector
+            scores[entry["expires"][:size] < time.time()] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            logger.debug(f"Semantic cache hit in '{namespace}' (cosine {scores[best]:.3f})")
+            return orjson.loads(entry["responses"][best])
+
+    def set(self, namespace: str, embedding, response: dict, ttl: Optional[int] = None):
+        """
+        Store a response
+
+        Expired rows are pruned and the namespace is trimmed to max_entries.
+
+        Args:
+            namespace: Cache namespace (e.g., 'classification')
+            embedding: Embedding of the prompt that produced the response
+            response: JSON-serializable response dict
+            ttl: Time-to-live in seconds (default: cache ttl)
+        """
+        vector = self._normalize(embedding)
+        payload = orjson.dumps(response).decode()
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.ttl)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO semantic_responses (namespace, embedding, response, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, vector.tobytes(), payload, expires_at)
+            )
+            self._conn.execute("DELETE FROM semantic_responses WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM semantic_responses WHERE namespace = ? AND id <= ("
+                "SELECT id FROM semantic_responses WHERE namespace = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (namespace, namespace, self.max_entries)
+            )
+            self._conn.commit()
+
+            # Picks up the new row along with anything other workers wrote
+            self._sync(namespace, self._entry(namespace), force=True)
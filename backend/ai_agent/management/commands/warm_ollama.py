@@ -0,0 +1,53 @@
+"""
+Keep the Ollama model loaded so requests don't pay the model-load latency
+
+Usage:
+    python manage.py warm_ollama                 # warm once
+    python manage.py warm_ollama --interval 45   # re-warm every 45 minutes
+"""
+
+import time
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_agent.agent import warm_up_ollama
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Load the Ollama model into memory and refresh its keep_alive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Minutes between warmups (0 = warm once and exit)'
+        )
+        parser.add_argument(
+            '--keep-alive',
+            default=None,
+            help="Ollama keep_alive duration (default: OLLAMA_KEEP_ALIVE, else the server's setting)"
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        while True:
+            try:
+                warm_up_ollama(
+                    settings.OLLAMA_BASE_URL,
+                    settings.OLLAMA_MODEL,
+                    options['keep_alive']
+                )
+                self.stdout.write(self.style.SUCCESS(f"Warmed up {settings.OLLAMA_MODEL}"))
+            except Exception as e:
+                if not interval:
+                    raise CommandError(f"Ollama warmup failed: {e}")
+                logger.error(f"Ollama warmup failed: {e}")
+
+            if not interval:
+                return
+            time.sleep(interval * 60)
@@ -0,0 +1,29 @@
+# backend/ai_agent/parsers.py
+"""
+Output parsers for the AI agent
+"""
+
+from typing import Any, List
+
+import orjson
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.outputs import Generation
+
+
+class OrjsonOutputParser(JsonOutputParser):
+    """
+    JsonOutputParser that decodes complete responses with orjson
+
+    Models asked for JSON almost always return a bare object, which orjson
+    parses several times faster than the stdlib. Anything else (markdown
+    fences, surrounding prose) and partial streaming chunks fall back to
+    LangChain's lenient parser.
+    """
+
+    def parse_result(self, result: List[Generation], *, partial: bool = False) -> Any:
+        if not partial:
+            try:
+                return orjson.loads(result[0].text.strip())
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse_result(result, partial=partial)
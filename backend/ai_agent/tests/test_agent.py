@@ -0,0 +1,176 @@
+"""
+Tests for the AI agent
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from langchain_community.llms.fake import FakeListLLM
+from langchain_core.runnables import RunnableLambda
+from ai_agent.agent import TaskAIAgent, TaskClassification, FAST_PATH_HITS, warm_up_ollama
+
+
+def make_agent(mocker, responses, constrained_decoding=False):
+    def initialize_llm(self):
+        self.constrained_decoding = constrained_decoding
+        return FakeListLLM(responses=responses)
+
+    mocker.patch.object(TaskAIAgent, '_initialize_llm', initialize_llm)
+    mocker.patch.object(TaskAIAgent, '_initialize_semantic_cache', return_value=None)
+    return TaskAIAgent(model='test-model', base_url='http://ollama:11434')
+
+
+class TestTaskAIAgent:
+    def test_invalid_classification_raises(self, mocker):
+        """Test a malformed response is reported instead of replaced by a default"""
+        agent = make_agent(mocker, ['{"category": "work"}'])
+
+        with pytest.raises(ValueError):
+            agent.classify_task('Invalid response task', 'Description')
+
+    def test_batch_returns_exception_per_failed_task(self, mocker):
+        """Test one bad batch item doesn't hide the others' results"""
+        agent = make_agent(mocker, [
+            '{"category": "work", "reasoning": "r", "priority": 4}',
+            'not json',
+        ])
+
+        results = agent.classify_tasks([
+            ('Batch task one', 'Prepare the quarterly report'),
+            ('Batch task two', 'Review the vendor contract'),
+        ])
+
+        assert results[0]['category'] == 'work'
+        assert isinstance(results[1], Exception)
+
+    def test_stream_failure_emits_no_complete_event(self, mocker):
+        """Test a failed step ends the stream with an error instead of a placeholder result"""
+        agent = make_agent(mocker, ['not json', 'not json'])
+
+        async def collect():
+            events = []
+            with pytest.raises(RuntimeError):
+                async for event in agent.analyze_task_stream_async('Stream failure task', 'Prepare the report'):
+                    events.append(event)
+            return events
+
+        events = asyncio.run(collect())
+
+        assert 'complete' not in [event['type'] for event in events]
+        assert any(event['type'] == 'error' for event in events)
+
+    def test_analyze_task_twice_on_shared_agent(self, mocker):
+        """Test repeated sync analyses on one agent don't spin up event loops"""
+        analysis = (
+            '{"classification": {"category": "work", "reasoning": "r", "priority": 4}, '
+            '"subtasks": {"subtasks": [{"title": "Draft", "description": "d"}], "reasoning": "r"}}'
+        )
+        agent = make_agent(mocker, [analysis, analysis])
+        mocker.patch('ai_agent.agent.asyncio.run', side_effect=AssertionError('asyncio.run called'))
+
+        first = agent.analyze_task('Shared agent task one', 'Prepare the quarterly report')
+        second = agent.analyze_task('Shared agent task two', 'Review the vendor contract')
+
+        assert first['classification']['category'] == 'work'
+        assert second['subtasks']['subtasks'] == [{'title': 'Draft', 'description': 'd'}]
+
+    def test_analyze_task_falls_back_to_separate_calls(self, mocker):
+        """Test an invalid combined analysis is redone as separate classify and subtask calls"""
+        agent = make_agent(mocker, [
+            '{"classification": {"category": "work"}, "subtasks": {"subtasks": [], "reasoning": "r"}}'
+        ])
+        agent._classify_chain = RunnableLambda(
+            lambda _: {'category': 'work', 'reasoning': 'r', 'priority': 4}
+        )
+        agent._subtasks_chain = RunnableLambda(
+            lambda _: {'subtasks': [{'title': 'Draft', 'description': 'd'}], 'reasoning': 'r'}
+        )
+
+        result = agent.analyze_task('Combined fallback task', 'Prepare the quarterly report')
+
+        assert result['classification']['category'] == 'work'
+        assert result['classification']['priority'] == 4
+        assert result['subtasks']['subtasks'] == [{'title': 'Draft', 'description': 'd'}]
+
+    def test_semantic_cache_errors_dont_fail_the_call(self, mocker):
+        """Test a broken semantic cache is skipped instead of failing a successful LLM call"""
+        agent = make_agent(mocker, ['{"category": "work", "reasoning": "r", "priority": 4}'])
+        agent.embedder = mocker.Mock()
+        agent.embedder.embed_query.return_value = [1.0, 0.0]
+        agent.semantic_cache = mocker.Mock()
+        agent.semantic_cache.get.return_value = None
+        agent.semantic_cache.set.side_effect = sqlite3.OperationalError('database is locked')
+
+        result = agent.classify_task('Semantic cache failure task', 'Prepare the quarterly report')
+
+        assert result['category'] == 'work'
+
+        agent.semantic_cache.get.side_effect = sqlite3.OperationalError('database is locked')
+        assert agent._cache_lookup('classification', 'Another cache failure task', 'Review the contract') == (None, None)
+
+    def test_cache_key_tracks_model_and_prompt(self, mocker):
+        """Test the exact cache key changes with the model and the prompt template"""
+        agent = make_agent(mocker, [])
+        key = agent._cache_key('classification', 'Cache key task', 'Description')
+
+        agent.model = 'other-model'
+        assert agent._cache_key('classification', 'Cache key task', 'Description') != key
+
+        agent.model = 'test-model'
+        mocker.patch.dict('ai_agent.agent.PROMPT_HASHES', {'classification': 'changed'})
+        assert agent._cache_key('classification', 'Cache key task', 'Description') != key
+
+    def test_trivial_task_skips_llm(self, mocker):
+        """Test short tasks are answered by rule without calling the model"""
+        agent = make_agent(mocker, [])
+        hits = FAST_PATH_HITS['full_analysis']
+
+        result = agent.analyze_task('Gym', '')
+
+        assert result['classification']['priority'] == 3
+        assert result['subtasks']['subtasks'] == [{'title': 'Gym', 'description': 'Complete this task'}]
+        assert FAST_PATH_HITS['full_analysis'] == hits + 1
+
+    def test_ollama_chains_bind_response_schema(self, mocker, monkeypatch):
+        """Test Ollama is constrained to each chain's JSON schema"""
+        monkeypatch.delenv('OLLAMA_JSON_SCHEMA', raising=False)
+        agent = make_agent(mocker, ['{}'], constrained_decoding=True)
+
+        llm = agent._classify_chain.steps[1]
+        assert llm.kwargs['format'] == TaskClassification.model_json_schema()
+
+    def test_initialize_llm_checks_tags_and_warms_in_background(self, mocker):
+        """Test agent construction lists models instead of generating"""
+        tags = mocker.patch('requests.get')
+        tags.return_value.json.return_value = {'models': [{'name': 'test-model:latest'}]}
+        post = mocker.patch('requests.post')
+        warm = mocker.patch('ai_agent.agent.warm_up_in_background')
+        mocker.patch.object(TaskAIAgent, '_initialize_semantic_cache', return_value=None)
+
+        agent = TaskAIAgent(model='test-model', base_url='http://ollama:11434')
+
+        tags.assert_called_once_with('http://ollama:11434/api/tags', timeout=2)
+        warm.assert_called_once_with('http://ollama:11434', 'test-model', pull=False)
+        post.assert_not_called()
+        assert agent.constrained_decoding is True
+
+
+class TestWarmUpOllama:
+    def test_server_keep_alive_applies_when_unset(self, mocker, monkeypatch):
+        """Test no keep_alive is sent unless one is configured"""
+        monkeypatch.delenv('OLLAMA_KEEP_ALIVE', raising=False)
+        post = mocker.patch('requests.post')
+
+        warm_up_ollama('http://ollama:11434', 'test-model')
+
+        assert 'keep_alive' not in post.call_args.kwargs['json']
+
+    def test_configured_keep_alive_is_sent(self, mocker, monkeypatch):
+        """Test OLLAMA_KEEP_ALIVE is forwarded to Ollama"""
+        monkeypatch.setenv('OLLAMA_KEEP_ALIVE', '-1')
+        post = mocker.patch('requests.post')
+
+        warm_up_ollama('http://ollama:11434', 'test-model')
+
+        assert post.call_args.kwargs['json']['keep_alive'] == '-1'
@@ -0,0 +1,93 @@
+"""
+Tests for the AI agent response caches
+"""
+
+import pytest
+from ai_agent.cache import ExactCache, SemanticCache
+
+
+class TestExactCache:
+    def test_returned_values_are_copies(self):
+        """Test mutating a stored or returned response doesn't change the cached entry"""
+        exact_cache = ExactCache()
+        response = {'subtasks': [{'title': 'Step 1'}]}
+        exact_cache.set('key', response)
+
+        response['subtasks'].append({'title': 'Added after set'})
+        exact_cache.get('key')['subtasks'][0]['title'] = 'Changed after get'
+
+        assert exact_cache.get('key') == {'subtasks': [{'title': 'Step 1'}]}
+
+    def test_least_recently_used_entry_evicted(self):
+        """Test a full cache evicts the entry read or written longest ago"""
+        exact_cache = ExactCache(maxsize=2)
+        exact_cache.set('a', {'n': 1})
+        exact_cache.set('b', {'n': 2})
+        exact_cache.get('a')
+        exact_cache.set('c', {'n': 3})
+
+        assert exact_cache.get('b') is None
+        assert exact_cache.get('a') == {'n': 1}
+        assert exact_cache.get('c') == {'n': 3}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'semantic.sqlite3')
+
+
+@pytest.fixture
+def semantic_cache(cache_path):
+    return SemanticCache(cache_path, threshold=0.9)
+
+
+class TestSemanticCache:
+    def test_hit_and_miss_at_threshold(self, semantic_cache):
+        """Test a lookup hits only when cosine similarity reaches the threshold"""
+        semantic_cache.set('classification', [1.0, 0.0], {'category': 'work'})
+
+        # cosine 0.95 and 0.8 against [1, 0]
+        assert semantic_cache.get('classification', [0.95, 0.3122499]) == {'category': 'work'}
+        assert semantic_cache.get('classification', [0.8, 0.6]) is None
+
+    def test_expired_entry_misses(self, semantic_cache, mocker):
+        """Test an entry is no longer served once its TTL has passed"""
+        now = mocker.patch('ai_agent.cache.time.time', return_value=1000.0)
+        semantic_cache.set('classification', [1.0, 0.0], {'category': 'work'}, ttl=60)
+        assert semantic_cache.get('classification', [1.0, 0.0]) == {'category': 'work'}
+
+        now.return_value = 1061.0
+        assert semantic_cache.get('classification', [1.0, 0.0]) is None
+
+    def test_namespaces_are_isolated(self, semantic_cache):
+        """Test a response is only served from the namespace it was stored in"""
+        semantic_cache.set('classification|model-a', [1.0, 0.0], {'category': 'work'})
+
+        assert semantic_cache.get('classification|model-b', [1.0, 0.0]) is None
+        assert semantic_cache.get('subtask_generation|model-a', [1.0, 0.0]) is None
+
+    def test_entries_from_other_workers_are_seen(self, cache_path):
+        """Test rows written through another connection are picked up on sync"""
+        reader = SemanticCache(cache_path, threshold=0.9, sync_interval=0)
+        writer = SemanticCache(cache_path, threshold=0.9)
+        assert reader.get('classification', [1.0, 0.0]) is None
+
+        writer.set('classification', [1.0, 0.0], {'category': 'work'})
+
+        assert reader.get('classification', [1.0, 0.0]) == {'category': 'work'}
+
+    def test_oldest_entries_evicted_past_max_entries(self, cache_path):
+        """Test each namespace keeps only its newest max_entries rows"""
+        semantic_cache = SemanticCache(cache_path, threshold=0.99, max_entries=2)
+        semantic_cache.set('classification', [1.0, 0.0], {'category': 'work'})
+        semantic_cache.set('classification', [0.0, 1.0], {'category': 'personal'})
+        semantic_cache.set('classification', [-1.0, 0.0], {'category': 'urgent'})
+
+        assert semantic_cache.get('classification', [1.0, 0.0]) is None
+        assert semantic_cache.get('classification', [0.0, 1.0]) == {'category': 'personal'}
+        count = semantic_cache._conn.execute('SELECT COUNT(*) FROM semantic_responses').fetchone()[0]
+        assert count == 2
+
+    def test_uses_write_ahead_log(self, semantic_cache):
+        """Test the shared cache file is opened in WAL mode"""
+        assert semantic_cache._conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
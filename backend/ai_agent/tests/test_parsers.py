@@ -0,0 +1,18 @@
+"""
+Tests for the agent's output parsers
+"""
+
+from ai_agent.parsers import OrjsonOutputParser
+
+
+def test_parses_bare_json():
+    """Test a bare JSON object is decoded"""
+    assert OrjsonOutputParser().parse('{"category": "work", "priority": 4}') == {
+        'category': 'work', 'priority': 4
+    }
+
+
+def test_falls_back_for_markdown_fenced_json():
+    """Test JSON wrapped in a markdown fence is still decoded"""
+    text = 'Here you go:\n```json\n{"category": "personal"}\n```'
+    assert OrjsonOutputParser().parse(text) == {'category': 'personal'}
@@ -0,0 +1,57 @@
+"""
+Tests for AI agent prompts
+"""
+
+import json
+import pytest
+from langchain_community.llms.fake import FakeListLLM
+from langchain_core.messages import SystemMessage
+from ai_agent.agent import (
+    TaskAIAgent,
+    TaskClassification,
+    SubtaskList,
+    FullTaskAnalysis,
+    CLASSIFICATION_SYSTEM_PROMPT,
+    SUBTASKS_SYSTEM_PROMPT,
+    FULL_ANALYSIS_SYSTEM_PROMPT,
+)
+
+SYSTEM_PROMPTS = [
+    (CLASSIFICATION_SYSTEM_PROMPT, TaskClassification),
+    (SUBTASKS_SYSTEM_PROMPT, SubtaskList),
+    (FULL_ANALYSIS_SYSTEM_PROMPT, FullTaskAnalysis),
+]
+
+
+def format_example(system_prompt):
+    """Return the JSON example the prompt asks the model to follow"""
+    lines = [line for line in system_prompt.splitlines() if line.startswith('{')]
+    assert len(lines) == 1
+    return json.loads(lines[0])
+
+
+@pytest.fixture
+def agent(mocker):
+    mocker.patch.object(TaskAIAgent, '_initialize_llm', return_value=FakeListLLM(responses=['{}']))
+    mocker.patch.object(TaskAIAgent, '_initialize_semantic_cache', return_value=None)
+    return TaskAIAgent(model='test-model', base_url='http://ollama:11434')
+
+
+class TestSystemPrompts:
+    @pytest.mark.parametrize('system_prompt,schema', SYSTEM_PROMPTS)
+    def test_format_example_matches_schema(self, system_prompt, schema):
+        """Test the hard-coded JSON example stays in sync with the output model"""
+        example = format_example(system_prompt)
+        assert set(example) == set(schema.model_fields)
+        schema.model_validate(example)
+
+    def test_system_message_is_sent_verbatim(self, agent):
+        """Test system prompts are static so provider prompt caching can hit"""
+        for prompt, system_prompt in [
+            (agent._classify_prompt, CLASSIFICATION_SYSTEM_PROMPT),
+            (agent._subtasks_prompt, SUBTASKS_SYSTEM_PROMPT),
+            (agent._full_prompt, FULL_ANALYSIS_SYSTEM_PROMPT),
+        ]:
+            messages = prompt.format_messages(title='Title', description='Description')
+            assert messages[0] == SystemMessage(content=system_prompt)
+            assert 'Title' in messages[1].content
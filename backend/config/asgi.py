@@ -0,0 +1,13 @@
+"""
+ASGI config for task manager project.
+
+Served by uvicorn so SSE streams don't each pin a worker.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
@@ -72,7 +72,9 @@ if os.getenv('DATABASE_URL'):
     DATABASES = {
         'default': dj_database_url.config(
             default=os.getenv('DATABASE_URL'),
-            conn_max_age=600,
+            # Under ASGI each sync_to_async call may run on a different thread,
+            # so persistent connections would pile up instead of being reused
+            conn_max_age=0,
             conn_health_checks=True,
         )
     }
@@ -136,6 +138,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -151,7 +157,7 @@ COGNITO_CLIENT_ID = os.getenv('COGNITO_CLIENT_ID', '')
 
 # Ollama settings
 OLLAMA_BASE_URL = os.getenv('OLLAMA_BASE_URL', 'http://ollama:11434')
-OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'llama3.2:3b')
+OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'llama3.2:3b-instruct-q4_K_M')
 
 # External AI API keys (fallback)
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
@@ -3,9 +3,13 @@ URL configuration for task manager project.
 """
 
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('tasks.urls')),
 ]
+
+# Admin assets in development (uvicorn doesn't serve static files like runserver); no-op unless DEBUG
+urlpatterns += staticfiles_urlpatterns()
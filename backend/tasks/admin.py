@@ -44,6 +44,7 @@ class TaskAdmin(admin.ModelAdmin):
         'created_at'
     ]
     list_filter = ['status', 'category', 'ai_classified', 'created_at']
+    list_select_related = ['user']
     search_fields = ['title', 'description', 'user__email']
     readonly_fields = ['created_at', 'updated_at']
     inlines = [SubtaskInline, AIAnalysisInline]
@@ -65,6 +66,7 @@ class TaskAdmin(admin.ModelAdmin):
 class SubtaskAdmin(admin.ModelAdmin):
     list_display = ['title', 'task', 'completed', 'order', 'ai_generated', 'created_at']
     list_filter = ['completed', 'ai_generated', 'created_at']
+    list_select_related = ['task']
     search_fields = ['title', 'description', 'task__title']
     list_editable = ['completed', 'order']
 
@@ -80,6 +82,7 @@ class AIAnalysisAdmin(admin.ModelAdmin):
         'created_at'
     ]
     list_filter = ['analysis_type', 'model_used', 'success', 'created_at']
+    list_select_related = ['task']
     search_fields = ['task__title', 'prompt', 'response']
     readonly_fields = ['created_at']
     fieldsets = (
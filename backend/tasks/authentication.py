@@ -2,14 +2,124 @@
 AWS Cognito Authentication for Django REST Framework
 """
 
-import boto3
+import jwt
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework import authentication, exceptions
 from .models import User
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Shared Cognito client: building one parses the service model and opens a
+# fresh connection pool, so it is created once and reused (clients are thread-safe)
+_COGNITO_CLIENT = None
+_COGNITO_CLIENT_LOCK = threading.Lock()
+
+
+def get_cognito_client():
+    """
+    Return the process-wide Cognito Identity Provider client
+    """
+    global _COGNITO_CLIENT
+
+    if _COGNITO_CLIENT is None:
+        with _COGNITO_CLIENT_LOCK:
+            if _COGNITO_CLIENT is None:
+                # Imported here so workers that never verify a token don't load botocore
+                import boto3
+                from botocore.config import Config
+
+                _COGNITO_CLIENT = boto3.client(
+                    'cognito-idp',
+                    region_name=settings.COGNITO_REGION,
+                    config=Config(max_pool_connections=50, retries={'max_attempts': 2})
+                )
+
+    return _COGNITO_CLIENT
+
+
+# The request user is only read for its id, email and Cognito id; skip the rest
+# of the row (password hash, names, flags)
+AUTH_USER_FIELDS = ('id', 'email', 'username', 'cognito_id')
+
+# Cognito rotates its signing keys rarely; a day-long cache keeps the key
+# fetch off the request path, and an unknown `kid` forces a refresh
+JWKS_CACHE_TTL = 24 * 60 * 60
+
+# Minimum seconds between forced refreshes, so tokens with made-up `kid`s
+# can't trigger a JWKS fetch on every request
+JWKS_REFRESH_INTERVAL = 5 * 60
+
+
+def _cognito_issuer():
+    return f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/{settings.COGNITO_USER_POOL_ID}"
+
+
+def get_cognito_jwks(refresh=False):
+    """
+    Return the user pool's JSON Web Key Set, cached in the Django cache
+
+    Args:
+        refresh: Bypass the cache and fetch the keys again, at most once
+            per JWKS_REFRESH_INTERVAL
+
+    Returns:
+        Dict mapping key id (kid) to JWK
+    """
+    cache_key = f"cognito_jwks:{settings.COGNITO_USER_POOL_ID}"
+    keys = cache.get(cache_key)
+
+    # cache.add is atomic: only the first refresh in the interval fetches
+    if refresh and cache.add(f"{cache_key}:refreshed", True, JWKS_REFRESH_INTERVAL):
+        keys = None
+
+    if keys is None:
+        import requests
+
+        response = requests.get(f"{_cognito_issuer()}/.well-known/jwks.json", timeout=5)
+        response.raise_for_status()
+        keys = {key['kid']: key for key in response.json()['keys']}
+        cache.set(cache_key, keys, JWKS_CACHE_TTL)
+
+    return keys
+
+
+def decode_cognito_token(token):
+    """
+    Verify a Cognito access token locally against the pool's JWKS
+
+    Args:
+        token: Access token (JWT)
+
+    Returns:
+        Verified token claims
+
+    Raises:
+        jwt.PyJWTError: If the signature, expiry, issuer or client is invalid
+    """
+    kid = jwt.get_unverified_header(token).get('kid')
+    jwk = get_cognito_jwks().get(kid) or get_cognito_jwks(refresh=True).get(kid)
+    if jwk is None:
+        raise jwt.InvalidKeyError(f"Unknown signing key: {kid}")
+
+    # Access tokens carry `client_id` instead of an `aud` claim
+    claims = jwt.decode(
+        token,
+        jwt.PyJWK(jwk).key,
+        algorithms=['RS256'],
+        issuer=_cognito_issuer(),
+        options={'verify_aud': False, 'require': ['exp', 'iss', 'username']}
+    )
+
+    if claims.get('token_use') != 'access':
+        raise jwt.InvalidTokenError('Not an access token')
+    if settings.COGNITO_CLIENT_ID and claims.get('client_id') != settings.COGNITO_CLIENT_ID:
+        raise jwt.InvalidTokenError('Token was issued for another client')
+
+    return claims
+
 
 class CognitoAuthentication(authentication.BaseAuthentication):
     """
@@ -52,24 +162,42 @@ class CognitoAuthentication(authentication.BaseAuthentication):
 
     def verify_token(self, token):
         """
-        Verify access token with AWS Cognito and get/create user
+        Verify access token and get/create user
+
+        The token is verified locally against the cached JWKS. Cognito's
+        GetUser API is only called for users not seen before (access tokens
+        don't carry the email) or when the JWKS can't be fetched; a token
+        that fails verification is rejected without any outbound call.
         """
         if not settings.COGNITO_USER_POOL_ID or not settings.COGNITO_REGION:
             # For development without Cognito, create a test user
             logger.warning("Cognito not configured. Using test authentication.")
-            user, _ = User.objects.get_or_create(
+            user, _ = User.objects.only(*AUTH_USER_FIELDS).get_or_create(
                 email='test@example.com',
                 defaults={'username': 'testuser'}
             )
             return user
 
         try:
-            # Initialize Cognito client
-            client = boto3.client(
-                'cognito-idp',
-                region_name=settings.COGNITO_REGION
-            )
+            claims = decode_cognito_token(token)
+        except jwt.PyJWTError:
+            raise exceptions.AuthenticationFailed('Token is invalid or expired')
+        except Exception as e:
+            logger.warning(f"Local token verification failed, asking Cognito: {str(e)}")
+        else:
+            user = User.objects.filter(cognito_id=claims['username']).only(*AUTH_USER_FIELDS).first()
+            if user is not None:
+                return user
 
+        return self.verify_token_with_cognito(token)
+
+    def verify_token_with_cognito(self, token):
+        """
+        Verify access token with the Cognito GetUser API and get/create user
+        """
+        client = get_cognito_client()
+
+        try:
             # Get user info from Cognito
             response = client.get_user(AccessToken=token)
 
@@ -82,7 +210,7 @@ class CognitoAuthentication(authentication.BaseAuthentication):
             email = attributes.get('email', '')
 
             # Get or create user
-            user, created = User.objects.get_or_create(
+            user, created = User.objects.only(*AUTH_USER_FIELDS).get_or_create(
                 cognito_id=cognito_id,
                 defaults={
                     'email': email,
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-15 22:21
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_subtask_counters(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    tasks = Task.objects.annotate(
+        total=Count("subtasks"),
+        completed=Count("subtasks", filter=Q(subtasks__completed=True)),
+    ).filter(total__gt=0)
+    for task in tasks.iterator():
+        Task.objects.filter(pk=task.pk).update(
+            subtask_total=task.total, subtask_completed=task.completed
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="subtask_completed",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="subtask_total",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_subtask_counters, migrations.RunPython.noop),
+    ]
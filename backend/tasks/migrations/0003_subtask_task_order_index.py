@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-15 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_task_subtask_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="subtask",
+            index=models.Index(
+                fields=["task", "order"], name="subtasks_task_id_35392e_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-15 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_subtask_task_order_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="aianalysis",
+            index=models.Index(
+                fields=["task", "-created_at"], name="ai_analyses_task_id_74ef8f_idx"
+            ),
+        ),
+    ]
@@ -3,6 +3,7 @@ Task Manager Models
 """
 
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import AbstractUser
 
 
@@ -71,6 +72,12 @@ class Task(models.Model):
         default=False,
         help_text="Whether this task has been classified by AI"
     )
+    # Denormalized subtask counters, kept current by tasks.signals
+    subtask_total = models.IntegerField(default=0)
+    subtask_completed = models.IntegerField(default=0)
+
+    # Written only by refresh_subtask_counts, never by save()
+    COUNTER_FIELDS = ('subtask_total', 'subtask_completed')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -86,6 +93,36 @@ class Task(models.Model):
     def __str__(self):
         return f"{self.title} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        """
+        Save the task without touching the subtask counters
+
+        An instance loaded before a slow operation (e.g., an LLM call) would
+        otherwise overwrite counters that changed in the meantime.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def refresh_subtask_counts(cls, *task_ids):
+        """Recompute the denormalized subtask counters in a single UPDATE"""
+        subtasks = Subtask.objects.filter(task=models.OuterRef('pk')).order_by().values('task')
+        cls.objects.filter(pk__in=task_ids).update(
+            subtask_total=Coalesce(
+                models.Subquery(subtasks.annotate(n=models.Count('pk')).values('n')), 0
+            ),
+            subtask_completed=Coalesce(
+                models.Subquery(subtasks.filter(completed=True).annotate(n=models.Count('pk')).values('n')), 0
+            ),
+        )
+
 
 class Subtask(models.Model):
     """
@@ -105,6 +142,9 @@ class Subtask(models.Model):
 
     class Meta:
         ordering = ['order', 'created_at']
+        indexes = [
+            models.Index(fields=['task', 'order']),
+        ]
         db_table = 'subtasks'
 
     def __str__(self):
@@ -151,6 +191,9 @@ class AIAnalysis(models.Model):
         ordering = ['-created_at']
         db_table = 'ai_analyses'
         verbose_name_plural = 'AI Analyses'
+        indexes = [
+            models.Index(fields=['task', '-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.analysis_type} for {self.task.title} ({self.created_at})"
@@ -0,0 +1,16 @@
+"""
+Pagination classes for Tasks API
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class AIAnalysisCursorPagination(CursorPagination):
+    """
+    Keyset pagination for AI analysis history
+
+    Pages are fetched with `created_at < cursor` range scans instead of
+    OFFSET, and no COUNT(*) runs over the whole history.
+    """
+    page_size = 20
+    ordering = '-created_at'
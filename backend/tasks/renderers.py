@@ -0,0 +1,49 @@
+"""
+Renderers for Tasks API
+"""
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson
+
+    Types orjson doesn't handle natively (lazy translation strings, Decimal,
+    querysets, ...) are delegated to DRF's encoder. Indented output (the
+    browsable API, `?indent=`) uses the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return orjson.dumps(data, default=JSONEncoder().default)
+
+
+class ServerSentEventRenderer(BaseRenderer):
+    """Custom renderer for Server-Sent Events"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Return data as-is (already formatted as SSE in the view)"""
+        return data
+
+
+class CSVRenderer(BaseRenderer):
+    """Renderer for CSV exports (streamed directly by the view)"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Return data as-is (already formatted as CSV in the view)"""
+        return data
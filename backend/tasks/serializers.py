@@ -61,11 +61,14 @@ class AIAnalysisSerializer(serializers.ModelSerializer):
 class TaskSerializer(serializers.ModelSerializer):
     """
     Serializer for Task model with nested subtasks
+
+    Pass context['subtasks'] to serialize an already-loaded subtask list
+    instead of querying task.subtasks.
     """
-    subtasks = SubtaskSerializer(many=True, read_only=True)
+    subtasks = serializers.SerializerMethodField()
     user_email = serializers.EmailField(source='user.email', read_only=True)
-    subtask_count = serializers.SerializerMethodField()
-    completed_subtask_count = serializers.SerializerMethodField()
+    subtask_count = serializers.IntegerField(source='subtask_total', read_only=True)
+    completed_subtask_count = serializers.IntegerField(source='subtask_completed', read_only=True)
 
     class Meta:
         model = Task
@@ -87,13 +90,12 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
-    def get_subtask_count(self, obj):
-        """Get total number of subtasks"""
-        return obj.subtasks.count()
-
-    def get_completed_subtask_count(self, obj):
-        """Get number of completed subtasks"""
-        return obj.subtasks.filter(completed=True).count()
+    def get_subtasks(self, obj):
+        """Serialize the subtasks from context, or the task's (prefetched) subtasks"""
+        subtasks = self.context.get('subtasks')
+        if subtasks is None:
+            subtasks = obj.subtasks.all()
+        return SubtaskSerializer(subtasks, many=True, context=self.context).data
 
     def validate_title(self, value):
         """Validate task title"""
@@ -112,6 +114,18 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
+class TaskDetailSerializer(TaskSerializer):
+    """
+    Serializer for a single task, with its most recent AI analyses
+
+    Expects the view to prefetch `recent_analyses`.
+    """
+    recent_analyses = AIAnalysisSerializer(many=True, read_only=True)
+
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ['recent_analyses']
+
+
 class TaskCreateSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for creating tasks
@@ -141,8 +155,8 @@ class TaskListSerializer(serializers.ModelSerializer):
     Lightweight serializer for listing tasks (without subtasks)
     """
     user_email = serializers.EmailField(source='user.email', read_only=True)
-    subtask_count = serializers.SerializerMethodField()
-    completed_subtask_count = serializers.SerializerMethodField()
+    subtask_count = serializers.IntegerField(source='subtask_total', read_only=True)
+    completed_subtask_count = serializers.IntegerField(source='subtask_completed', read_only=True)
 
     class Meta:
         model = Task
@@ -161,14 +175,6 @@ class TaskListSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
 
-    def get_subtask_count(self, obj):
-        """Get total number of subtasks"""
-        return obj.subtasks.count()
-
-    def get_completed_subtask_count(self, obj):
-        """Get number of completed subtasks"""
-        return obj.subtasks.filter(completed=True).count()
-
 
 class AIClassificationResultSerializer(serializers.Serializer):
     """
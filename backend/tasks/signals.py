@@ -0,0 +1,58 @@
+"""
+Signal handlers for Tasks app
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Task, Subtask
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_subtask_counts(*task_ids):
+    """
+    Suspend per-row counter updates, then recompute the given tasks once
+
+    For bulk writes (queryset delete + bulk_create) that would otherwise
+    issue one UPDATE per row, or none at all for bulk_create.
+    """
+    _deferred.depth = getattr(_deferred, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _deferred.depth -= 1
+        Task.refresh_subtask_counts(*task_ids)
+
+
+def _counts_deferred():
+    return getattr(_deferred, 'depth', 0) > 0
+
+
+@receiver(post_init, sender=Subtask)
+def remember_subtask_task(sender, instance, **kwargs):
+    """Remember the loaded task so a subtask moved to another task updates both"""
+    # Read from __dict__ so a deferred task_id doesn't trigger a query
+    instance._loaded_task_id = instance.__dict__.get('task_id')
+
+
+@receiver(post_save, sender=Subtask)
+def update_counts_on_save(sender, instance, **kwargs):
+    """Keep Task.subtask_total/subtask_completed current after a subtask changes"""
+    if _counts_deferred():
+        return
+    task_ids = {instance.task_id, instance._loaded_task_id} - {None}
+    Task.refresh_subtask_counts(*task_ids)
+    instance._loaded_task_id = instance.task_id
+
+
+@receiver(post_delete, sender=Subtask)
+def update_counts_on_delete(sender, instance, **kwargs):
+    """Keep Task.subtask_total/subtask_completed current after a subtask is deleted"""
+    if _counts_deferred():
+        return
+    Task.refresh_subtask_counts(instance.task_id)
@@ -0,0 +1,60 @@
+"""
+Shared fixtures for Tasks tests
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture(scope='session')
+def shared_user(django_db_setup, django_db_blocker):
+    """
+    One user for the whole session, created outside the per-test transactions
+
+    Read-only: tests that change the user must create their own.
+    """
+    with django_db_blocker.unblock():
+        user, _ = User.objects.get_or_create(
+            email='shared@example.com',
+            defaults={'username': 'shareduser'}
+        )
+
+    yield user
+
+    with django_db_blocker.unblock():
+        user.delete()
+
+
+@pytest.fixture
+def user(db, shared_user):
+    return shared_user
+
+
+@pytest.fixture(scope='class')
+def class_task(shared_user, django_db_blocker):
+    """
+    One task per test class, created outside the per-test transactions
+
+    Each test's own writes (subtasks, counter updates) are rolled back by
+    its django_db transaction, so every test starts from the same row.
+    """
+    with django_db_blocker.unblock():
+        task = Task.objects.create(
+            user=shared_user,
+            title='Main Task',
+            description='Main task description'
+        )
+
+    yield task
+
+    with django_db_blocker.unblock():
+        task.delete()
+
+
+@pytest.fixture
+def task(db, class_task):
+    class_task.refresh_from_db()
+    return class_task
@@ -2,11 +2,16 @@
 Tests for Tasks API
 """
 
+import json
+
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.db import DataError
 from rest_framework.test import APIClient
 from rest_framework import status
-from tasks.models import Task, Subtask
+from tasks.models import Task, Subtask, AIAnalysis
+from tasks.views import FALLBACK_AGENT_TTL, TaskViewSet, _agents, _get_agent
 
 User = get_user_model()
 
@@ -16,20 +21,22 @@ def api_client():
     return APIClient()
 
 
-@pytest.fixture
-def user(db):
-    return User.objects.create(
-        email='test@example.com',
-        username='testuser'
-    )
-
-
 @pytest.fixture
 def authenticated_client(api_client, user):
     api_client.force_authenticate(user=user)
     return api_client
 
 
+@pytest.fixture
+def mock_agent(mocker):
+    """Patch the shared AI agent the views use"""
+    _agents.clear()
+    agent = mocker.patch('tasks.views.TaskAIAgent').return_value
+    agent.model = 'test-model'
+    yield agent
+    _agents.clear()
+
+
 @pytest.mark.django_db
 class TestTaskAPI:
     def test_create_task(self, authenticated_client):
@@ -53,6 +60,21 @@ class TestTaskAPI:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 2
 
+    def test_list_tasks_subtask_counts(self, authenticated_client, user, django_assert_max_num_queries):
+        """Test the list returns subtask counts without loading subtasks"""
+        for i in range(5):
+            task = Task.objects.create(user=user, title=f'Task {i}', description='Desc')
+            Subtask.objects.create(task=task, title='Done', completed=True)
+            Subtask.objects.create(task=task, title='Open')
+
+        with django_assert_max_num_queries(2):
+            response = authenticated_client.get('/api/tasks/')
+
+        assert response.status_code == status.HTTP_200_OK
+        for result in response.data['results']:
+            assert result['subtask_count'] == 2
+            assert result['completed_subtask_count'] == 1
+
     def test_retrieve_task(self, authenticated_client, user):
         """Test retrieving a single task"""
         task = Task.objects.create(
@@ -64,6 +86,23 @@ class TestTaskAPI:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['title'] == 'Test Task'
 
+    def test_retrieve_task_recent_analyses(self, authenticated_client, user, django_assert_max_num_queries):
+        """Test retrieve embeds the latest AI analyses in one prefetch"""
+        task = Task.objects.create(user=user, title='Test Task', description='Test description')
+        for i in range(7):
+            AIAnalysis.objects.create(
+                task=task, analysis_type='classification', prompt='p', response='r',
+                model_used='test-model', duration_ms=i
+            )
+
+        # task, subtasks, analyses
+        with django_assert_max_num_queries(3):
+            response = authenticated_client.get(f'/api/tasks/{task.id}/')
+
+        assert response.status_code == status.HTTP_200_OK
+        durations = [a['duration_ms'] for a in response.data['recent_analyses']]
+        assert durations == [6, 5, 4, 3, 2]
+
     def test_update_task(self, authenticated_client, user):
         """Test updating a task"""
         task = Task.objects.create(
@@ -100,6 +139,8 @@ class TestTaskAPI:
         response = authenticated_client.post(f'/api/tasks/{task.id}/complete/')
         assert response.status_code == status.HTTP_200_OK
         assert response.data['status'] == 'completed'
+        task.refresh_from_db()
+        assert task.status == 'completed'
 
     def test_reopen_task(self, authenticated_client, user):
         """Test reopening a task"""
@@ -141,9 +182,8 @@ class TestTaskAPI:
 
 @pytest.mark.django_db
 class TestSubtaskAPI:
-    def test_create_subtask(self, authenticated_client, user):
+    def test_create_subtask(self, authenticated_client, task):
         """Test creating a subtask"""
-        task = Task.objects.create(user=user, title='Main Task', description='Main desc')
         data = {
             'task': task.id,
             'title': 'Subtask 1',
@@ -154,9 +194,8 @@ class TestSubtaskAPI:
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data['title'] == 'Subtask 1'
 
-    def test_toggle_subtask(self, authenticated_client, user):
+    def test_toggle_subtask(self, authenticated_client, task):
         """Test toggling subtask completion"""
-        task = Task.objects.create(user=user, title='Main Task', description='Main desc')
         subtask = Subtask.objects.create(
             task=task,
             title='Subtask 1',
@@ -165,18 +204,360 @@ class TestSubtaskAPI:
         response = authenticated_client.patch(f'/api/subtasks/{subtask.id}/toggle/')
         assert response.status_code == status.HTTP_200_OK
         assert response.data['completed'] is True
+        task.refresh_from_db()
+        assert task.subtask_completed == 1
 
         # Toggle again
         response = authenticated_client.patch(f'/api/subtasks/{subtask.id}/toggle/')
         assert response.status_code == status.HTTP_200_OK
         assert response.data['completed'] is False
 
-    def test_list_subtasks_for_task(self, authenticated_client, user):
+    def test_toggle_other_users_subtask(self, authenticated_client):
+        """Test toggling a subtask of another user's task returns 404"""
+        other_user = User.objects.create(email='other@example.com', username='other')
+        other_task = Task.objects.create(user=other_user, title='Not mine', description='Hidden')
+        subtask = Subtask.objects.create(task=other_task, title='Hidden step')
+
+        response = authenticated_client.patch(f'/api/subtasks/{subtask.id}/toggle/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        subtask.refresh_from_db()
+        assert subtask.completed is False
+
+    def test_toggle_invalid_pk(self, authenticated_client):
+        """Test toggling with a non-numeric pk returns 404"""
+        response = authenticated_client.patch('/api/subtasks/abc/toggle/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_subtasks_for_task(self, authenticated_client, task):
         """Test listing subtasks for a specific task"""
-        task = Task.objects.create(user=user, title='Main Task', description='Main desc')
         Subtask.objects.create(task=task, title='Subtask 1', order=1)
         Subtask.objects.create(task=task, title='Subtask 2', order=2)
 
         response = authenticated_client.get(f'/api/subtasks/?task={task.id}')
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 2
+
+
+class TestGetAgent:
+    def test_ollama_agent_is_shared(self, mocker):
+        """Test an agent on Ollama is built once and reused"""
+        _agents.clear()
+        agent_class = mocker.patch('tasks.views.TaskAIAgent')
+        agent_class.return_value.using_fallback = False
+
+        assert _get_agent('m', 'u') is _get_agent('m', 'u')
+        agent_class.assert_called_once()
+        _agents.clear()
+
+    def test_fallback_agent_reprobes_after_ttl(self, mocker):
+        """Test an agent on the external fallback is rebuilt once its TTL expires"""
+        _agents.clear()
+        agent_class = mocker.patch('tasks.views.TaskAIAgent')
+        agent_class.return_value.using_fallback = True
+        monotonic = mocker.patch('tasks.views.time.monotonic', return_value=1000.0)
+
+        _get_agent('m', 'u')
+        _get_agent('m', 'u')
+        assert agent_class.call_count == 1
+
+        monotonic.return_value = 1000.0 + FALLBACK_AGENT_TTL
+        _get_agent('m', 'u')
+        assert agent_class.call_count == 2
+        _agents.clear()
+
+
+@pytest.mark.django_db
+class TestAIActionsAPI:
+    def test_suggest_subtasks_replaces_ai_subtasks(self, authenticated_client, user, mock_agent,
+                                                   django_assert_max_num_queries):
+        """Test AI subtasks are replaced in bulk and the counters follow"""
+        task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        Subtask.objects.create(task=task, title='Old AI step', ai_generated=True)
+        Subtask.objects.create(task=task, title='Manual step', completed=True)
+
+        mock_agent.suggest_subtasks.return_value = {
+            'subtasks': [{'title': f'Step {i}', 'description': 'd'} for i in range(3)],
+            'reasoning': 'r'
+        }
+
+        # get_object, the replace (kept SELECT, collect, DELETE, INSERT, counter
+        # UPDATE, counter read-back) and the savepoint; the response reuses the
+        # created subtasks
+        with django_assert_max_num_queries(9):
+            response = authenticated_client.post(f'/api/tasks/{task.id}/ai_suggest_subtasks/')
+        assert response.status_code == status.HTTP_200_OK
+        assert [s['title'] for s in response.data['created_subtasks']] == ['Step 0', 'Step 1', 'Step 2']
+        assert response.data['task']['subtask_count'] == 4
+        assert response.data['task']['completed_subtask_count'] == 1
+        assert sorted(s['title'] for s in response.data['task']['subtasks']) == [
+            'Manual step', 'Step 0', 'Step 1', 'Step 2'
+        ]
+        assert not task.subtasks.filter(title='Old AI step').exists()
+
+    def test_replace_ai_subtasks_keeps_related_manager(self, user):
+        """Test the replaced task's subtasks manager still supports queryset methods"""
+        task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        Subtask.objects.create(task=task, title='Manual step')
+        task = Task.objects.prefetch_related('subtasks').get(pk=task.pk)
+
+        created, subtasks = TaskViewSet._replace_ai_subtasks(task, [{'title': 'New step'}])
+
+        assert [s.title for s in subtasks] == ['Manual step', 'New step']
+        assert task.subtask_total == 2
+        assert task.subtasks.filter(ai_generated=True).count() == 1
+
+    def test_classify_keeps_subtask_toggled_during_llm_call(self, authenticated_client, user, mock_agent):
+        """Test a subtask toggled while the LLM runs is still counted afterwards"""
+        task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        subtask = Subtask.objects.create(task=task, title='Book venue')
+
+        def classify(title, description):
+            response = authenticated_client.patch(f'/api/subtasks/{subtask.id}/toggle/')
+            assert response.status_code == status.HTTP_200_OK
+            return {'category': 'work', 'reasoning': 'r', 'priority': 4}
+
+        mock_agent.classify_task.side_effect = classify
+
+        response = authenticated_client.post(f'/api/tasks/{task.id}/ai_classify/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['task']['category'] == 'work'
+
+        task.refresh_from_db()
+        assert task.subtask_completed == 1
+
+    def test_success_logged_after_commit(self, authenticated_client, user, mock_agent, mocker,
+                                         django_capture_on_commit_callbacks):
+        """Test the AIAnalysis row is handed to the log pool once the writes commit"""
+        task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        submit = mocker.patch('tasks.views._log_pool.submit')
+        mock_agent.classify_task.return_value = {'category': 'work', 'reasoning': 'r', 'priority': 4}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_client.post(f'/api/tasks/{task.id}/ai_classify/')
+
+        assert response.status_code == status.HTTP_200_OK
+        submit.assert_called_once()
+        fields = submit.call_args.args[1]
+        assert fields['task_id'] == task.id
+        assert fields['analysis_type'] == 'classification'
+
+
+@pytest.mark.django_db
+class TestAIStreamAPI:
+    def _read_events(self, response):
+        async def read_body():
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        body = async_to_sync(read_body)().decode()
+        return [
+            (block.split('\n')[0].removeprefix('event: '), json.loads(block.split('\n')[1].removeprefix('data: ')))
+            for block in body.strip().split('\n\n')
+        ]
+
+    def test_stream_emits_events_and_saves_task(self, authenticated_client, user, mock_agent):
+        """Test the SSE stream relays the agent's events and saves the final result"""
+        task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        result = {
+            'classification': {'category': 'work', 'reasoning': 'r', 'priority': 4},
+            'subtasks': {'subtasks': [{'title': 'Book venue', 'description': 'd'}], 'reasoning': 'r'},
+        }
+
+        async def stream(title, description):
+            yield {'type': 'start', 'message': 'Starting'}
+            yield {'type': 'token', 'step': 'classification', 'data': {'category': 'wo'}}
+            yield {'type': 'complete', 'message': 'Done', 'data': result}
+
+        mock_agent.analyze_task_stream_async = stream
+
+        response = authenticated_client.get(f'/api/tasks/{task.id}/ai_analyze_stream/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/event-stream'
+
+        events = self._read_events(response)
+        assert [event_type for event_type, _ in events] == ['start', 'token', 'complete']
+        assert events[-1][1]['data'] == result
+
+        task.refresh_from_db()
+        assert task.category == 'work'
+        assert task.priority == 4
+        assert list(task.subtasks.values_list('title', flat=True)) == ['Book venue']
+
+    def test_stream_failure_saves_nothing(self, authenticated_client, user, mock_agent):
+        """Test a failed stream leaves the task alone and logs a failed analysis"""
+        task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite', priority=5)
+        Subtask.objects.create(task=task, title='Old AI step', ai_generated=True)
+
+        async def stream(title, description):
+            yield {'type': 'start', 'message': 'Starting'}
+            yield {'type': 'error', 'step': 'classification', 'message': 'Classification failed'}
+            raise RuntimeError('Analysis failed (classification: bad output)')
+
+        mock_agent.analyze_task_stream_async = stream
+
+        response = authenticated_client.get(f'/api/tasks/{task.id}/ai_analyze_stream/')
+        events = self._read_events(response)
+
+        assert [event_type for event_type, _ in events] == ['start', 'error', 'error']
+        task.refresh_from_db()
+        assert task.priority == 5
+        assert task.subtasks.filter(title='Old AI step').exists()
+        analysis = AIAnalysis.objects.get(task=task)
+        assert analysis.success is False
+        assert 'bad output' in analysis.error_message
+
+
+@pytest.mark.django_db
+class TestAIBulkAPI:
+    def test_analyze_bulk(self, authenticated_client, user, mock_agent):
+        """Test analyzing several tasks in one request"""
+        task1 = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        task2 = Task.objects.create(user=user, title='Buy groceries', description='Milk and bread')
+        other_user = User.objects.create(email='other@example.com', username='other')
+        other_task = Task.objects.create(user=other_user, title='Not mine', description='Hidden')
+
+        mock_agent.analyze_tasks.side_effect = lambda pairs: [
+            {
+                'classification': {'category': 'work', 'reasoning': 'r', 'priority': 4},
+                'subtasks': {'subtasks': [{'title': f'Step for {title}', 'description': 'd'}], 'reasoning': 'r'},
+            }
+            for title, _ in pairs
+        ]
+
+        response = authenticated_client.post(
+            '/api/tasks/analyze-bulk/',
+            {'task_ids': [task1.id, task2.id, other_task.id]},
+            format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+
+        task1.refresh_from_db()
+        assert task1.category == 'work'
+        assert task1.ai_classified is True
+        assert task1.subtasks.filter(ai_generated=True).count() == 1
+        assert other_task.subtasks.count() == 0
+
+    def test_analyze_bulk_requires_task_ids(self, authenticated_client):
+        """Test bulk analysis rejects a missing or empty task list"""
+        response = authenticated_client.post('/api/tasks/analyze-bulk/', {'task_ids': []}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_analyze_bulk_reports_failed_tasks(self, authenticated_client, user, mock_agent):
+        """Test a failed analysis is reported per task without discarding the others"""
+        ok_task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        bad_task = Task.objects.create(user=user, title='Buy groceries', description='Milk and bread')
+
+        mock_agent.analyze_tasks.side_effect = lambda pairs: [
+            ValueError('Invalid json output') if title == bad_task.title else {
+                'classification': {'category': 'work', 'reasoning': 'r', 'priority': 4},
+                'subtasks': {'subtasks': [], 'reasoning': 'r'},
+            }
+            for title, _ in pairs
+        ]
+
+        response = authenticated_client.post(
+            '/api/tasks/analyze-bulk/',
+            {'task_ids': [ok_task.id, bad_task.id]},
+            format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        results = {result['task']['id']: result for result in response.data['results']}
+        assert results[ok_task.id]['classification']['category'] == 'work'
+        assert 'Invalid json output' in results[bad_task.id]['error']
+        assert AIAnalysis.objects.get(task=bad_task).success is False
+
+    def test_analyze_bulk_save_failure_is_per_task(self, authenticated_client, user, mock_agent, mocker):
+        """Test a task whose writes fail is reported without rolling back the others"""
+        ok_task = Task.objects.create(user=user, title='Plan retreat', description='Team offsite')
+        bad_task = Task.objects.create(user=user, title='Buy groceries', description='Milk and bread')
+
+        mock_agent.analyze_tasks.side_effect = lambda pairs: [
+            {
+                'classification': {'category': 'work', 'reasoning': 'r', 'priority': 4},
+                'subtasks': {'subtasks': [{'title': 'Step', 'description': 'd'}], 'reasoning': 'r'},
+            }
+            for _ in pairs
+        ]
+        replace = TaskViewSet._replace_ai_subtasks
+
+        def replace_or_fail(task, subtasks_data):
+            if task.pk == bad_task.pk:
+                raise DataError('value too long for type character varying(255)')
+            return replace(task, subtasks_data)
+
+        mocker.patch.object(TaskViewSet, '_replace_ai_subtasks', side_effect=replace_or_fail)
+
+        response = authenticated_client.post(
+            '/api/tasks/analyze-bulk/',
+            {'task_ids': [ok_task.id, bad_task.id]},
+            format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        results = {result['task']['id']: result for result in response.data['results']}
+        assert results[ok_task.id]['classification']['category'] == 'work'
+        assert 'value too long' in results[bad_task.id]['error']
+        assert results[bad_task.id]['task']['category'] is None
+
+        ok_task.refresh_from_db()
+        bad_task.refresh_from_db()
+        assert ok_task.category == 'work'
+        assert bad_task.category is None
+        assert AIAnalysis.objects.get(task=bad_task).success is False
+
+
+@pytest.mark.django_db
+class TestAIAnalysisAPI:
+    def _create_analyses(self, task, count):
+        for i in range(count):
+            AIAnalysis.objects.create(
+                task=task,
+                analysis_type='classification',
+                prompt='p',
+                response='r',
+                model_used='test-model',
+                duration_ms=i
+            )
+
+    def test_list_uses_cursor_pagination(self, authenticated_client, task):
+        """Test the history pages by cursor without a total count"""
+        self._create_analyses(task, 25)
+
+        response = authenticated_client.get('/api/ai-analyses/')
+        assert response.status_code == status.HTTP_200_OK
+        assert 'count' not in response.data
+        assert len(response.data['results']) == 20
+
+        response = authenticated_client.get(response.data['next'])
+        assert len(response.data['results']) == 5
+        assert response.data['next'] is None
+
+    def test_list_streams_csv(self, authenticated_client, task):
+        """Test ?format=csv streams every analysis"""
+        self._create_analyses(task, 3)
+
+        response = authenticated_client.get('/api/ai-analyses/?format=csv')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        assert response['Content-Type'] == 'text/csv'
+
+        async def read_body():
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        lines = async_to_sync(read_body)().decode().splitlines()
+        assert lines[0].startswith('id,task,analysis_type')
+        assert len(lines) == 4
+
+    def test_csv_only_for_list(self, authenticated_client, task):
+        """Test CSV isn't offered on retrieve and errors stay JSON"""
+        self._create_analyses(task, 1)
+        analysis = AIAnalysis.objects.get(task=task)
+
+        response = authenticated_client.get(f'/api/ai-analyses/{analysis.id}/?format=csv')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = APIClient().get('/api/ai-analyses/?format=csv')
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+        assert response['Content-Type'] == 'application/json'
+        assert 'detail' in response.json()
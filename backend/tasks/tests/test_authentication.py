@@ -0,0 +1,102 @@
+"""
+Tests for Cognito token verification
+"""
+
+import json
+import time
+import pytest
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.cache import cache
+from rest_framework import exceptions
+from tasks.authentication import CognitoAuthentication
+from tasks.models import User
+
+POOL_ID = 'us-east-1_test'
+ISSUER = f'https://cognito-idp.us-east-1.amazonaws.com/{POOL_ID}'
+
+
+@pytest.fixture
+def signing_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def cognito(settings, mocker, signing_key):
+    """Configure Cognito and serve the test key from the JWKS endpoint"""
+    settings.COGNITO_USER_POOL_ID = POOL_ID
+    settings.COGNITO_REGION = 'us-east-1'
+    settings.COGNITO_CLIENT_ID = 'client-123'
+    cache.clear()
+
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(signing_key.public_key()))
+    jwk.update({'kid': 'key-1', 'alg': 'RS256', 'use': 'sig'})
+    response = mocker.Mock()
+    response.json.return_value = {'keys': [jwk]}
+    return mocker.patch('requests.get', return_value=response)
+
+
+def make_token(signing_key, **claims):
+    payload = {
+        'iss': ISSUER,
+        'sub': 'sub-1',
+        'username': 'cognito-user-1',
+        'client_id': 'client-123',
+        'token_use': 'access',
+        'exp': int(time.time()) + 3600,
+        **claims
+    }
+    return jwt.encode(payload, signing_key, algorithm='RS256', headers={'kid': 'key-1'})
+
+
+@pytest.mark.django_db
+class TestCognitoAuthentication:
+    def test_known_user_verified_locally(self, cognito, signing_key, mocker):
+        """Test a valid token for a known user skips the Cognito API"""
+        user = User.objects.create(email='a@example.com', username='a', cognito_id='cognito-user-1')
+        get_client = mocker.patch('tasks.authentication.get_cognito_client')
+
+        auth = CognitoAuthentication()
+        assert auth.verify_token(make_token(signing_key)) == user
+        assert auth.verify_token(make_token(signing_key)) == user
+
+        get_client.assert_not_called()
+        cognito.assert_called_once()  # JWKS fetched once, then cached
+
+    def test_unknown_user_falls_back_to_cognito(self, cognito, signing_key, mocker):
+        """Test a first-time user is created from the GetUser response"""
+        client = mocker.patch('tasks.authentication.get_cognito_client').return_value
+        client.get_user.return_value = {
+            'Username': 'cognito-user-1',
+            'UserAttributes': [{'Name': 'email', 'Value': 'new@example.com'}]
+        }
+
+        user = CognitoAuthentication().verify_token(make_token(signing_key))
+
+        assert user.cognito_id == 'cognito-user-1'
+        assert user.email == 'new@example.com'
+
+    def test_unknown_kid_refreshes_jwks_once_per_interval(self, cognito, signing_key, mocker):
+        """Test tokens with made-up key ids neither refetch the JWKS each time nor call Cognito"""
+        get_client = mocker.patch('tasks.authentication.get_cognito_client')
+        token = jwt.encode(
+            {'iss': ISSUER, 'username': 'cognito-user-1', 'exp': int(time.time()) + 3600},
+            signing_key, algorithm='RS256', headers={'kid': 'made-up'}
+        )
+
+        for _ in range(3):
+            with pytest.raises(exceptions.AuthenticationFailed):
+                CognitoAuthentication().verify_token(token)
+
+        assert cognito.call_count == 2  # initial fetch + one throttled refresh
+        get_client.assert_not_called()
+
+    def test_expired_token_rejected(self, cognito, signing_key, mocker):
+        """Test an expired token fails without calling Cognito"""
+        get_client = mocker.patch('tasks.authentication.get_cognito_client')
+        token = make_token(signing_key, exp=int(time.time()) - 60)
+
+        with pytest.raises(exceptions.AuthenticationFailed):
+            CognitoAuthentication().verify_token(token)
+
+        get_client.assert_not_called()
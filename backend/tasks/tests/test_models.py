@@ -33,9 +33,8 @@ class TestUserModel:
 
 @pytest.mark.django_db
 class TestTaskModel:
-    def test_create_task(self):
+    def test_create_task(self, user):
         """Test creating a task"""
-        user = User.objects.create(email='test@example.com', username='testuser')
         task = Task.objects.create(
             user=user,
             title='Test Task',
@@ -47,9 +46,8 @@ class TestTaskModel:
         assert task.category is None
         assert task.ai_classified is False
 
-    def test_task_string_representation(self):
+    def test_task_string_representation(self, user):
         """Test task string representation"""
-        user = User.objects.create(email='test@example.com', username='testuser')
         task = Task.objects.create(
             user=user,
             title='Test Task',
@@ -57,9 +55,8 @@ class TestTaskModel:
         )
         assert str(task) == 'Test Task (pending)'
 
-    def test_task_with_category_and_priority(self):
+    def test_task_with_category_and_priority(self, user):
         """Test creating a task with category and priority"""
-        user = User.objects.create(email='test@example.com', username='testuser')
         task = Task.objects.create(
             user=user,
             title='Work Task',
@@ -73,14 +70,8 @@ class TestTaskModel:
 
 @pytest.mark.django_db
 class TestSubtaskModel:
-    def test_create_subtask(self):
+    def test_create_subtask(self, task):
         """Test creating a subtask"""
-        user = User.objects.create(email='test@example.com', username='testuser')
-        task = Task.objects.create(
-            user=user,
-            title='Main Task',
-            description='Main task description'
-        )
         subtask = Subtask.objects.create(
             task=task,
             title='Subtask 1',
@@ -92,14 +83,8 @@ class TestSubtaskModel:
         assert subtask.order == 1
         assert subtask.ai_generated is False
 
-    def test_subtask_ordering(self):
+    def test_subtask_ordering(self, task):
         """Test subtask ordering"""
-        user = User.objects.create(email='test@example.com', username='testuser')
-        task = Task.objects.create(
-            user=user,
-            title='Main Task',
-            description='Main task description'
-        )
         subtask2 = Subtask.objects.create(task=task, title='Subtask 2', order=2)
         subtask1 = Subtask.objects.create(task=task, title='Subtask 1', order=1)
         subtask3 = Subtask.objects.create(task=task, title='Subtask 3', order=3)
@@ -112,14 +97,8 @@ class TestSubtaskModel:
 
 @pytest.mark.django_db
 class TestAIAnalysisModel:
-    def test_create_ai_analysis(self):
+    def test_create_ai_analysis(self, task):
         """Test creating an AI analysis record"""
-        user = User.objects.create(email='test@example.com', username='testuser')
-        task = Task.objects.create(
-            user=user,
-            title='Test Task',
-            description='Test description'
-        )
         analysis = AIAnalysis.objects.create(
             task=task,
             analysis_type='classification',
@@ -131,3 +110,49 @@ class TestAIAnalysisModel:
         assert analysis.analysis_type == 'classification'
         assert analysis.model_used == 'llama3.2:3b'
         assert analysis.success is True
+
+
+@pytest.mark.django_db
+class TestSubtaskCounters:
+    def test_counters_follow_subtask_changes(self, task):
+        """Test the denormalized subtask counters track create/update/delete"""
+        first = Subtask.objects.create(task=task, title='First')
+        Subtask.objects.create(task=task, title='Second', completed=True)
+        task.refresh_from_db()
+        assert (task.subtask_total, task.subtask_completed) == (2, 1)
+
+        first.completed = True
+        first.save()
+        task.refresh_from_db()
+        assert (task.subtask_total, task.subtask_completed) == (2, 2)
+
+        first.delete()
+        task.refresh_from_db()
+        assert (task.subtask_total, task.subtask_completed) == (1, 1)
+
+    def test_save_keeps_concurrent_counter_changes(self, task):
+        """Test saving a stale task instance doesn't overwrite the counters"""
+        stale = Task.objects.get(pk=task.pk)
+        Subtask.objects.create(task=task, title='Added meanwhile', completed=True)
+
+        stale.title = 'Renamed'
+        stale.save()
+
+        task.refresh_from_db()
+        assert task.title == 'Renamed'
+        assert (task.subtask_total, task.subtask_completed) == (1, 1)
+
+    def test_counters_follow_moved_subtask(self, user):
+        """Test moving a subtask updates both tasks"""
+        source = Task.objects.create(user=user, title='Source', description='Desc')
+        target = Task.objects.create(user=user, title='Target', description='Desc')
+        subtask = Subtask.objects.create(task=source, title='Moving')
+
+        subtask = Subtask.objects.get(pk=subtask.pk)
+        subtask.task = target
+        subtask.save()
+
+        source.refresh_from_db()
+        target.refresh_from_db()
+        assert source.subtask_total == 0
+        assert target.subtask_total == 1
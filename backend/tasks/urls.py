@@ -2,18 +2,25 @@
 URL configuration for Tasks API
 """
 
+from django.http import JsonResponse
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import TaskViewSet, SubtaskViewSet, AIAnalysisViewSet
 
-router = DefaultRouter()
+router = SimpleRouter()
 router.register(r'tasks', TaskViewSet, basename='task')
 router.register(r'subtasks', SubtaskViewSet, basename='subtask')
 router.register(r'ai-analyses', AIAnalysisViewSet, basename='ai-analysis')
 
-from django.http import JsonResponse
+_OK = {'status': 'ok'}
+
+
+def health(request):
+    """Liveness probe for the load balancer and Docker healthcheck"""
+    return JsonResponse(_OK)
+
 
 urlpatterns = [
     path('', include(router.urls)),
-    path('health/', lambda request: JsonResponse({'status': 'ok'})),
+    path('health/', health, name='health'),
 ]
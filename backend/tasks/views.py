@@ -2,21 +2,32 @@
 Views for Tasks API
 """
 
-import json
+import csv
 import time
+import threading
+import orjson
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Prefetch
+from django.http import Http404
 from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.renderers import BaseRenderer
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Task, Subtask, AIAnalysis
+from .pagination import AIAnalysisCursorPagination
+from .renderers import CSVRenderer, ORJSONRenderer, ServerSentEventRenderer
+from .signals import deferred_subtask_counts
 from .serializers import (
     TaskSerializer,
+    TaskDetailSerializer,
     TaskListSerializer,
     TaskCreateSerializer,
     SubtaskSerializer,
@@ -28,15 +39,56 @@ from ai_agent.agent import TaskAIAgent
 logger = logging.getLogger(__name__)
 
 
-class ServerSentEventRenderer(BaseRenderer):
-    """Custom renderer for Server-Sent Events"""
-    media_type = 'text/event-stream'
-    format = 'sse'
-    charset = 'utf-8'
+# Seconds before an agent on the external fallback re-probes Ollama, which may
+# have been down or still pulling the model when the agent was built
+FALLBACK_AGENT_TTL = 60
 
-    def render(self, data, accepted_media_type=None, renderer_context=None):
-        """Return data as-is (already formatted as SSE in the view)"""
-        return data
+_agents = {}
+_agents_lock = threading.Lock()
+
+
+def _get_agent(model, base_url):
+    """
+    Return a shared TaskAIAgent per (model, base_url)
+
+    Building an agent probes Ollama and compiles the prompt chains; the
+    chains are stateless, so one agent serves every request and thread.
+    Fallback agents are rebuilt after FALLBACK_AGENT_TTL.
+    """
+    key = (model, base_url)
+    with _agents_lock:
+        agent, expires_at = _agents.get(key, (None, None))
+        if agent is None or (expires_at is not None and time.monotonic() >= expires_at):
+            agent = TaskAIAgent(model=model, base_url=base_url)
+            expires_at = time.monotonic() + FALLBACK_AGENT_TTL if agent.using_fallback else None
+            _agents[key] = (agent, expires_at)
+        return agent
+
+
+# Successful AIAnalysis rows are audit data nobody waits for; a small pool
+# writes them so responses (and SSE streams) don't block on the insert
+_log_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ai-analysis-log')
+
+
+def _write_analysis(fields):
+    """Insert an AIAnalysis row from a pool thread"""
+    close_old_connections()
+    try:
+        AIAnalysis.objects.create(**fields)
+    except Exception as e:
+        logger.error(f"Failed to log AI analysis: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def _log_analysis_async(**fields):
+    """Queue an AIAnalysis row to be written after the current transaction commits"""
+    transaction.on_commit(lambda: _log_pool.submit(_write_analysis, fields))
+
+
+def _sse_event(event_type, payload):
+    """Format one Server-Sent Event as bytes, so each event is a single write"""
+    return b"event: " + event_type.encode() + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
 
 
 class TaskViewSet(viewsets.ModelViewSet):
@@ -50,14 +102,49 @@ class TaskViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'updated_at', 'title', 'priority']
     ordering = ['-created_at']
 
+    # Upper bound on tasks accepted by ai_analyze_bulk
+    MAX_BULK_ANALYSIS = 50
+
+    # AI analyses embedded in the retrieve response
+    RECENT_ANALYSES = 5
+
+    # Columns the task serializers read; the joined user row only needs its email
+    TASK_FIELDS = (
+        'id', 'user', 'title', 'description', 'status', 'category',
+        'priority', 'ai_classified', 'subtask_total', 'subtask_completed',
+        'created_at', 'updated_at'
+    )
+
     def get_queryset(self):
         """Return tasks for the current user only"""
-        return Task.objects.filter(user=self.request.user).prefetch_related('subtasks')
+        queryset = (
+            Task.objects.filter(user=self.request.user)
+            .select_related('user')
+            .only(*self.TASK_FIELDS, 'user__email')
+        )
+
+        # TaskListSerializer has no nested subtasks (counts are stored on Task);
+        # the AI subtask actions read them fresh inside their transaction
+        if self.action in ('list', 'ai_suggest_subtasks', 'ai_analyze'):
+            return queryset
+        queryset = queryset.prefetch_related('subtasks')
+
+        # Saves the client a follow-up /ai-analyses/?task= request
+        if self.action == 'retrieve':
+            recent = AIAnalysis.objects.defer('prompt', 'response').order_by('-created_at')
+            queryset = queryset.prefetch_related(Prefetch(
+                'ai_analyses',
+                queryset=recent[:self.RECENT_ANALYSES],
+                to_attr='recent_analyses'
+            ))
+        return queryset
 
     def get_serializer_class(self):
         """Use different serializers for different actions"""
         if self.action == 'list':
             return TaskListSerializer
+        elif self.action == 'retrieve':
+            return TaskDetailSerializer
         elif self.action == 'create':
             return TaskCreateSerializer
         return TaskSerializer
@@ -66,12 +153,19 @@ class TaskViewSet(viewsets.ModelViewSet):
         """Set the user when creating a task"""
         serializer.save(user=self.request.user)
 
+    @staticmethod
+    def _set_status(task, new_status):
+        """Write just the status column and mirror it on the loaded instance"""
+        now = timezone.now()
+        Task.objects.filter(pk=task.pk).update(status=new_status, updated_at=now)
+        task.status = new_status
+        task.updated_at = now
+
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
         """Mark a task as completed"""
         task = self.get_object()
-        task.status = 'completed'
-        task.save()
+        self._set_status(task, 'completed')
         serializer = self.get_serializer(task)
         return Response(serializer.data)
 
@@ -79,8 +173,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     def reopen(self, request, pk=None):
         """Reopen a completed task"""
         task = self.get_object()
-        task.status = 'pending'
-        task.save()
+        self._set_status(task, 'pending')
         serializer = self.get_serializer(task)
         return Response(serializer.data)
 
@@ -94,33 +187,32 @@ class TaskViewSet(viewsets.ModelViewSet):
         try:
             start_time = time.time()
 
-            # Initialize AI agent
-            agent = TaskAIAgent(
-                model=settings.OLLAMA_MODEL,
-                base_url=settings.OLLAMA_BASE_URL
-            )
+            # Shared AI agent
+            agent = _get_agent(settings.OLLAMA_MODEL, settings.OLLAMA_BASE_URL)
 
             # Classify task
             result = agent.classify_task(task.title, task.description)
 
             duration_ms = int((time.time() - start_time) * 1000)
 
-            # Update task with classification
-            task.category = result.get('category', 'other')
-            task.priority = result.get('priority', 3)
-            task.ai_classified = True
-            task.save()
-
-            # Log AI analysis
-            AIAnalysis.objects.create(
-                task=task,
-                analysis_type='classification',
-                prompt=f"Title: {task.title}\nDescription: {task.description}",
-                response=str(result),
-                model_used=settings.OLLAMA_MODEL,
-                duration_ms=duration_ms,
-                success=True
-            )
+            # One commit for all writes; the LLM call stays outside the transaction
+            with transaction.atomic():
+                # Update task with classification
+                task.category = result.get('category', 'other')
+                task.priority = result.get('priority', 3)
+                task.ai_classified = True
+                task.save(update_fields=['category', 'priority', 'ai_classified', 'updated_at'])
+
+                # Log AI analysis (written after commit, off the request path)
+                _log_analysis_async(
+                    task_id=task.pk,
+                    analysis_type='classification',
+                    prompt=f"Title: {task.title}\nDescription: {task.description}",
+                    response=orjson.dumps(result).decode(),
+                    model_used=settings.OLLAMA_MODEL,
+                    duration_ms=duration_ms,
+                    success=True
+                )
 
             return Response({
                 'classification': result,
@@ -156,49 +248,33 @@ class TaskViewSet(viewsets.ModelViewSet):
         try:
             start_time = time.time()
 
-            # Initialize AI agent
-            agent = TaskAIAgent(
-                model=settings.OLLAMA_MODEL,
-                base_url=settings.OLLAMA_BASE_URL
-            )
+            # Shared AI agent
+            agent = _get_agent(settings.OLLAMA_MODEL, settings.OLLAMA_BASE_URL)
 
             # Generate subtasks
             result = agent.suggest_subtasks(task.title, task.description)
 
             duration_ms = int((time.time() - start_time) * 1000)
 
-            # Delete existing AI-generated subtasks to prevent duplicates
-            Subtask.objects.filter(task=task, ai_generated=True).delete()
-
-            # Create new subtasks
-            subtasks_data = result.get('subtasks', [])
-            created_subtasks = []
-
-            for idx, subtask_data in enumerate(subtasks_data):
-                subtask = Subtask.objects.create(
-                    task=task,
-                    title=subtask_data.get('title', ''),
-                    description=subtask_data.get('description', ''),
-                    order=idx,
-                    ai_generated=True
+            # One commit for all writes; the LLM call stays outside the transaction
+            with transaction.atomic():
+                created_subtasks, subtasks = self._replace_ai_subtasks(task, result.get('subtasks', []))
+
+                # Log AI analysis (written after commit, off the request path)
+                _log_analysis_async(
+                    task_id=task.pk,
+                    analysis_type='subtask_generation',
+                    prompt=f"Title: {task.title}\nDescription: {task.description}",
+                    response=orjson.dumps(result).decode(),
+                    model_used=settings.OLLAMA_MODEL,
+                    duration_ms=duration_ms,
+                    success=True
                 )
-                created_subtasks.append(subtask)
-
-            # Log AI analysis
-            AIAnalysis.objects.create(
-                task=task,
-                analysis_type='subtask_generation',
-                prompt=f"Title: {task.title}\nDescription: {task.description}",
-                response=str(result),
-                model_used=settings.OLLAMA_MODEL,
-                duration_ms=duration_ms,
-                success=True
-            )
 
             return Response({
                 'subtasks': result,
                 'created_subtasks': SubtaskSerializer(created_subtasks, many=True).data,
-                'task': TaskSerializer(task).data
+                'task': TaskSerializer(task, context={'subtasks': subtasks}).data
             })
 
         except Exception as e:
@@ -230,56 +306,21 @@ class TaskViewSet(viewsets.ModelViewSet):
         try:
             start_time = time.time()
 
-            # Initialize AI agent
-            agent = TaskAIAgent(
-                model=settings.OLLAMA_MODEL,
-                base_url=settings.OLLAMA_BASE_URL
-            )
+            # Shared AI agent
+            agent = _get_agent(settings.OLLAMA_MODEL, settings.OLLAMA_BASE_URL)
 
             # Analyze task
             result = agent.analyze_task(task.title, task.description)
 
             duration_ms = int((time.time() - start_time) * 1000)
 
-            # Update task with classification
+            subtasks = self._save_analysis(task, result, duration_ms)
             classification = result.get('classification', {})
-            task.category = classification.get('category', 'other')
-            task.priority = classification.get('priority', 3)
-            task.ai_classified = True
-            task.save()
-
-            # Delete existing AI-generated subtasks to prevent duplicates
-            Subtask.objects.filter(task=task, ai_generated=True).delete()
-
-            # Create new subtasks
-            subtasks_data = result.get('subtasks', {}).get('subtasks', [])
-            created_subtasks = []
-
-            for idx, subtask_data in enumerate(subtasks_data):
-                subtask = Subtask.objects.create(
-                    task=task,
-                    title=subtask_data.get('title', ''),
-                    description=subtask_data.get('description', ''),
-                    order=idx,
-                    ai_generated=True
-                )
-                created_subtasks.append(subtask)
-
-            # Log AI analysis
-            AIAnalysis.objects.create(
-                task=task,
-                analysis_type='full_analysis',
-                prompt=f"Title: {task.title}\nDescription: {task.description}",
-                response=str(result),
-                model_used=settings.OLLAMA_MODEL,
-                duration_ms=duration_ms,
-                success=True
-            )
 
             return Response({
                 'classification': classification,
                 'subtasks': result.get('subtasks', {}),
-                'task': TaskSerializer(task).data
+                'task': TaskSerializer(task, context={'subtasks': subtasks}).data
             })
 
         except Exception as e:
@@ -301,6 +342,163 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['post'], url_path='analyze-bulk')
+    def ai_analyze_bulk(self, request):
+        """
+        Perform complete AI analysis for several tasks in one batched call
+
+        Expects {"task_ids": [...]}; tasks not owned by the user are skipped.
+        A task whose analysis failed gets an 'error' entry instead of results.
+        """
+        task_ids = request.data.get('task_ids')
+        if (not isinstance(task_ids, list) or not task_ids
+                or not all(isinstance(task_id, int) for task_id in task_ids)):
+            return Response(
+                {'error': 'task_ids must be a non-empty list of task IDs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(task_ids) > self.MAX_BULK_ANALYSIS:
+            return Response(
+                {'error': f'At most {self.MAX_BULK_ANALYSIS} tasks can be analyzed at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        tasks = list(self.get_queryset().filter(pk__in=task_ids))
+
+        try:
+            start_time = time.time()
+
+            # Shared AI agent
+            agent = _get_agent(settings.OLLAMA_MODEL, settings.OLLAMA_BASE_URL)
+
+            # Analyze all tasks concurrently
+            results = agent.analyze_tasks([(task.title, task.description) for task in tasks])
+
+            duration_ms = int((time.time() - start_time) * 1000)
+
+        except Exception as e:
+            logger.error(f"Bulk AI analysis failed: {str(e)}")
+            return Response(
+                {'error': f'AI analysis failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        # Save every task in one transaction, each in its own savepoint so a
+        # failed write only discards that task's changes
+        saved_subtasks = {}
+        results = list(results)
+        with transaction.atomic():
+            for idx, (task, result) in enumerate(zip(tasks, results)):
+                if not isinstance(result, Exception):
+                    try:
+                        with transaction.atomic():
+                            # The batch has no per-task latency to log
+                            saved_subtasks[task.pk] = self._save_analysis(task, result, None)
+                        continue
+                    except Exception as e:
+                        logger.error(f"Saving AI analysis for task {task.pk} failed: {str(e)}")
+                        task.refresh_from_db()
+                        result = results[idx] = e
+
+                # Log failed analysis; the other tasks are still saved
+                AIAnalysis.objects.create(
+                    task=task,
+                    analysis_type='full_analysis',
+                    prompt=f"Title: {task.title}\nDescription: {task.description}",
+                    response='',
+                    model_used=settings.OLLAMA_MODEL,
+                    success=False,
+                    error_message=str(result)
+                )
+
+        response_data = []
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                response_data.append({
+                    'error': f'AI analysis failed: {str(result)}',
+                    'task': TaskSerializer(task).data
+                })
+                continue
+
+            response_data.append({
+                'classification': result.get('classification', {}),
+                'subtasks': result.get('subtasks', {}),
+                'task': TaskSerializer(task, context={'subtasks': saved_subtasks[task.pk]}).data
+            })
+
+        return Response({'results': response_data, 'duration_ms': duration_ms})
+
+    @transaction.atomic(savepoint=False)
+    def _save_analysis(self, task, result, duration_ms):
+        """
+        Apply a full analysis result to a task: classification, AI subtasks and log
+
+        Runs in a single transaction (joining the caller's, if any).
+
+        Returns:
+            list of the task's subtasks after the update
+        """
+        # Update task with classification
+        classification = result.get('classification', {})
+        task.category = classification.get('category', 'other')
+        task.priority = classification.get('priority', 3)
+        task.ai_classified = True
+        task.save(update_fields=['category', 'priority', 'ai_classified', 'updated_at'])
+
+        _, subtasks = self._replace_ai_subtasks(
+            task, result.get('subtasks', {}).get('subtasks', [])
+        )
+
+        # Log AI analysis (written after commit, off the request path)
+        _log_analysis_async(
+            task_id=task.pk,
+            analysis_type='full_analysis',
+            prompt=f"Title: {task.title}\nDescription: {task.description}",
+            response=orjson.dumps(result).decode(),
+            model_used=settings.OLLAMA_MODEL,
+            duration_ms=duration_ms,
+            success=True
+        )
+
+        return subtasks
+
+    @staticmethod
+    def _replace_ai_subtasks(task, subtasks_data):
+        """
+        Replace a task's AI-generated subtasks with one DELETE and one bulk INSERT
+
+        Must be called inside a transaction. The task's counters are read back
+        after the write. The returned subtask list can be passed to
+        TaskSerializer as context['subtasks'], so the response doesn't
+        re-query them.
+
+        Returns:
+            (created Subtask objects, all of the task's subtasks in display order)
+        """
+        with deferred_subtask_counts(task.pk):
+            # Manual subtasks are kept; read them fresh rather than from a
+            # prefetch that may predate a concurrent toggle
+            kept = list(Subtask.objects.filter(task=task, ai_generated=False))
+
+            # Delete existing AI-generated subtasks to prevent duplicates
+            Subtask.objects.filter(task=task, ai_generated=True).delete()
+
+            created_subtasks = Subtask.objects.bulk_create([
+                Subtask(
+                    task=task,
+                    title=subtask_data.get('title', ''),
+                    description=subtask_data.get('description', ''),
+                    order=idx,
+                    ai_generated=True
+                )
+                for idx, subtask_data in enumerate(subtasks_data)
+            ])
+
+        # The counters were recomputed in the database; read back what was written
+        task.refresh_from_db(fields=list(Task.COUNTER_FIELDS))
+        subtasks = sorted(kept + created_subtasks, key=lambda s: (s.order, s.created_at))
+        return created_subtasks, subtasks
+
     @action(detail=True, methods=['get'], renderer_classes=[ServerSentEventRenderer])
     def ai_analyze_stream(self, request, pk=None):
         """
@@ -311,63 +509,45 @@ class TaskViewSet(viewsets.ModelViewSet):
         """
         task = self.get_object()
 
-        def event_stream():
-            """Generator that yields SSE-formatted events"""
+        async def event_stream():
+            """
+            Async generator that yields SSE-formatted events
+
+            Under ASGI the stream waits on the LLM without holding a worker
+            thread; the ORM writes run in a thread via sync_to_async.
+            """
             try:
-                # Initialize AI agent
-                agent = TaskAIAgent(
-                    model=settings.OLLAMA_MODEL,
-                    base_url=settings.OLLAMA_BASE_URL
-                )
+                # Shared AI agent
+                agent = await sync_to_async(_get_agent)(settings.OLLAMA_MODEL, settings.OLLAMA_BASE_URL)
+                start_time = time.time()
 
                 # Stream analysis progress
-                for event in agent.analyze_task_stream(task.title, task.description):
-                    # Format as SSE event
+                async for event in agent.analyze_task_stream_async(task.title, task.description):
+                    # Persist the result before announcing it, so a client that
+                    # refetches on complete sees the updated task
                     event_type = event.get('type', 'message')
+                    if event_type == 'complete' and 'data' in event:
+                        duration_ms = int((time.time() - start_time) * 1000)
+                        await sync_to_async(self._save_analysis)(task, event['data'], duration_ms)
 
                     # Send event
-                    yield f"event: {event_type}\n"
-                    yield f"data: {json.dumps(event)}\n\n"
-
-                    # If this is the complete event, update the task
-                    if event_type == 'complete' and 'data' in event:
-                        result = event['data']
-                        classification = result.get('classification', {})
-                        subtasks_data = result.get('subtasks', {}).get('subtasks', [])
-
-                        # Update task
-                        task.category = classification.get('category', 'other')
-                        task.priority = classification.get('priority', 3)
-                        task.ai_classified = True
-                        task.save()
-
-                        # Delete existing AI-generated subtasks to prevent duplicates
-                        Subtask.objects.filter(task=task, ai_generated=True).delete()
-
-                        # Create new subtasks
-                        for idx, subtask_data in enumerate(subtasks_data):
-                            Subtask.objects.create(
-                                task=task,
-                                title=subtask_data.get('title', ''),
-                                description=subtask_data.get('description', ''),
-                                order=idx,
-                                ai_generated=True
-                            )
-
-                        # Log AI analysis
-                        AIAnalysis.objects.create(
-                            task=task,
-                            analysis_type='full_analysis',
-                            prompt=f"Title: {task.title}\nDescription: {task.description}",
-                            response=json.dumps(result),
-                            model_used=settings.OLLAMA_MODEL,
-                            success=True
-                        )
+                    yield _sse_event(event_type, event)
 
             except Exception as e:
                 logger.error(f"SSE stream error: {str(e)}")
-                yield f"event: error\n"
-                yield f"data: {json.dumps({'message': str(e)})}\n\n"
+
+                # Log failed analysis
+                await sync_to_async(AIAnalysis.objects.create)(
+                    task=task,
+                    analysis_type='full_analysis',
+                    prompt=f"Title: {task.title}\nDescription: {task.description}",
+                    response='',
+                    model_used=settings.OLLAMA_MODEL,
+                    success=False,
+                    error_message=str(e)
+                )
+
+                yield _sse_event('error', {'message': str(e)})
 
         # Return SSE response
         response = StreamingHttpResponse(
@@ -397,22 +577,82 @@ class SubtaskViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['patch'])
     def toggle(self, request, pk=None):
         """Toggle subtask completion status"""
-        subtask = self.get_object()
-        subtask.completed = not subtask.completed
-        subtask.save()
+        # Flip in the database, so concurrent toggles can't lose an update;
+        # bypasses post_save, so refresh the task counters here
+        try:
+            subtasks = self.get_queryset().filter(pk=pk)
+        except (TypeError, ValueError):
+            raise Http404
+
+        with transaction.atomic():
+            updated = subtasks.update(completed=~F('completed'), updated_at=timezone.now())
+            if not updated:
+                raise Http404
+            subtask = Subtask.objects.get(pk=pk)
+            Task.refresh_subtask_counts(subtask.task_id)
+
         serializer = self.get_serializer(subtask)
         return Response(serializer.data)
 
 
+class _Echo:
+    """File-like object that returns what is written, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
 class AIAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing AI analysis history (read-only)
+
+    `?format=csv` on the list streams the whole (filtered) history as CSV.
     """
     serializer_class = AIAnalysisSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = AIAnalysisCursorPagination
     filterset_fields = ['task', 'analysis_type', 'success', 'model_used']
     ordering = ['-created_at']
 
     def get_queryset(self):
         """Return AI analyses for tasks owned by the current user"""
-        return AIAnalysis.objects.filter(task__user=self.request.user)
+        # prompt/response are large text blobs the serializer never renders
+        return AIAnalysis.objects.filter(
+            task__user=self.request.user
+        ).defer('prompt', 'response')
+
+    def get_renderers(self):
+        """Offer CSV on the list action only; other actions 404 on ?format=csv"""
+        renderers = super().get_renderers()
+        if self.action == 'list':
+            renderers.append(CSVRenderer())
+        return renderers
+
+    def handle_exception(self, exc):
+        """Report errors as JSON even when CSV was requested"""
+        accepted_renderer = getattr(self.request, 'accepted_renderer', None)
+        if isinstance(accepted_renderer, CSVRenderer):
+            self.request.accepted_renderer = ORJSONRenderer()
+            self.request.accepted_media_type = ORJSONRenderer.media_type
+        return super().handle_exception(exc)
+
+    def list(self, request, *args, **kwargs):
+        """List analyses, streaming them as CSV when requested"""
+        if request.accepted_renderer.format != 'csv':
+            return super().list(request, *args, **kwargs)
+
+        fields = AIAnalysisSerializer.Meta.fields
+        # values(), not values_list(): on Django 5.0 values_list().aiterator()
+        # runs its query from the event loop thread
+        rows = self.filter_queryset(self.get_queryset()).values(*fields)
+        writer = csv.writer(_Echo())
+
+        # Async, so ASGI streams it instead of buffering a sync iterator
+        async def csv_stream():
+            yield writer.writerow(fields)
+            async for row in rows.aiterator(chunk_size=200):
+                yield writer.writerow([row[field] for field in fields])
+
+        response = StreamingHttpResponse(csv_stream(), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="ai-analyses.csv"'
+        return response
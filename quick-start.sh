@@ -5,7 +5,7 @@
 set -e  # Exit on error
 
 MODE="${1:-dev}"
-OLLAMA_MODEL="${OLLAMA_MODEL:-llama3.2:3b}"
+OLLAMA_MODEL="${OLLAMA_MODEL:-llama3.2:3b-instruct-q4_K_M}"
 
 echo "================================================"
 echo "Task Manager AI - Quick Start"